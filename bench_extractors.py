@@ -0,0 +1,128 @@
+"""
+Compare the entity-extractor tiers behind extract_entities.
+
+For each backend it reports load time, per-document latency, peak memory
+added by loading and running it, and how closely its poll options match
+the large spaCy model's. Each backend runs in a fresh process so memory
+numbers do not bleed into each other.
+
+Article text comes from the app's own article cache (eko_content.db), so
+run the app for a while first, or point --texts at a folder of .txt files.
+
+    python bench_extractors.py
+    python bench_extractors.py --backends rules sm lg --texts samples/
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import resource
+import sqlite3
+import statistics
+import time
+import zlib
+
+
+def load_texts(texts_dir, db_path, limit):
+    if texts_dir:
+        paths = sorted(glob.glob(os.path.join(texts_dir, "*.txt")))[:limit]
+        return [open(p, encoding="utf-8").read() for p in paths]
+
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("""
+        SELECT body FROM article_cache
+        ORDER BY accessed_at DESC
+        LIMIT ?
+    """, (limit * 2,)).fetchall()
+    conn.close()
+
+    texts = [json.loads(zlib.decompress(body))["text"] for (body,) in rows]
+    return [t for t in texts if t][:limit]
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+def run_backend(name, texts):
+    import voting
+
+    before = peak_rss_mb()
+
+    start = time.perf_counter()
+    extractor = voting.ENTITY_EXTRACTORS[name]()
+    load_s = time.perf_counter() - start
+
+    # Warm up once, then time documents one by one and as a single batch.
+    extractor.extract_batch(texts[:1])
+
+    single = []
+    for text in texts:
+        start = time.perf_counter()
+        extractor.extract_batch([text])
+        single.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    counts = extractor.extract_batch(texts)
+    batch_ms = (time.perf_counter() - start) * 1000 / max(len(texts), 1)
+
+    return {
+        "name": name,
+        "load_s": load_s,
+        "p50_ms": statistics.median(single) if single else 0.0,
+        "batch_ms": batch_ms,
+        "rss_mb": peak_rss_mb() - before,
+        "options": [voting.options_from_entities(c) for c in counts],
+    }
+
+
+def overlap(options, reference):
+    scores = [
+        len(set(a) & set(b)) / len(set(a) | set(b))
+        for a, b in zip(options, reference)
+        if a or b
+    ]
+    return statistics.mean(scores) if scores else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["rules", "sm", "md", "lg"])
+    parser.add_argument("--texts", help="folder of .txt article bodies")
+    parser.add_argument("--db", default="eko_content.db")
+    parser.add_argument("--limit", type=int, default=200)
+    args = parser.parse_args()
+
+    texts = load_texts(args.texts, args.db, args.limit)
+
+    if not texts:
+        raise SystemExit("No article text found; run the app first or pass --texts.")
+
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+
+    for name in args.backends:
+        with ctx.Pool(1) as pool:
+            try:
+                results[name] = pool.apply(run_backend, (name, texts))
+            except OSError as exc:
+                print(f"{name}: skipped ({exc})")
+
+    reference = results.get("lg")
+
+    print(f"\n{len(texts)} documents\n")
+    print(f"{'backend':<8} {'load s':>8} {'p50 ms/doc':>11} {'batch ms/doc':>13} {'peak MB':>8} {'overlap vs lg':>14}")
+
+    for r in results.values():
+        match = f"{overlap(r['options'], reference['options']):.2f}" if reference else "n/a"
+        print(
+            f"{r['name']:<8} {r['load_s']:>8.2f} {r['p50_ms']:>11.2f} "
+            f"{r['batch_ms']:>13.2f} {r['rss_mb']:>8.0f} {match:>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
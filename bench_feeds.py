@@ -0,0 +1,128 @@
+"""
+Compare the lxml fast path in parse_feed with plain feedparser.
+
+Feeds are read from recorded copies so runs are repeatable and offline.
+Record the current NEWS_SOURCES feeds once, then benchmark against them:
+
+    python bench_feeds.py --record
+    python bench_feeds.py --repeat 50
+
+For each feed it reports the median parse time of both parsers, how many
+items each found, and how many items disagree on the fields the app stores.
+"""
+import argparse
+import calendar
+import glob
+import os
+import re
+import statistics
+import time
+
+
+def slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def record(voting, feeds_dir):
+    os.makedirs(feeds_dir, exist_ok=True)
+
+    for name, url in voting.NEWS_SOURCES.items():
+        try:
+            r = voting.requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=voting.FEED_FETCH_TIMEOUT)
+            r.raise_for_status()
+        except Exception as exc:
+            print(f"{name}: skipped ({exc})")
+            continue
+
+        path = os.path.join(feeds_dir, f"{slug(name)}.xml")
+
+        with open(path, "wb") as f:
+            f.write(r.content)
+
+        print(f"{name}: {len(r.content) / 1024:.0f} KiB -> {path}")
+
+
+def feedparser_items(voting, content):
+    items = []
+
+    for entry in voting.feedparser.parse(content).entries:
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+
+        items.append({
+            "link": entry.get("link", ""),
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", "") or entry.get("description", ""),
+            "published_ts": calendar.timegm(published) if published else None,
+            "image_url": voting.extract_image_from_entry(entry),
+        })
+
+    return items
+
+
+def timed(fn, content, repeat):
+    samples = []
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(content)
+        samples.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(samples), result
+
+
+def mismatches(fast, slow, summary_text):
+    count = 0
+
+    for a, b in zip(fast, slow):
+        if (
+            a["link"] != b["link"]
+            or a["published_ts"] != b["published_ts"]
+            or a["image_url"] != b["image_url"]
+            or summary_text(a["summary"]) != summary_text(b["summary"])
+        ):
+            count += 1
+
+    return count + abs(len(fast) - len(slow))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--feeds", default="bench_data/feeds", help="folder of recorded feeds")
+    parser.add_argument("--record", action="store_true", help="download NEWS_SOURCES into --feeds first")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    import voting
+
+    if args.record:
+        record(voting, args.feeds)
+
+    paths = sorted(glob.glob(os.path.join(args.feeds, "*.xml")))
+
+    if not paths:
+        raise SystemExit("No recorded feeds; run with --record first.")
+
+    print(f"{'feed':<20} {'KiB':>6} {'lxml ms':>8} {'feedparser ms':>14} {'speedup':>8} {'items':>9} {'diff':>5}")
+
+    for path in paths:
+        with open(path, "rb") as f:
+            content = f.read()
+
+        fast_ms, fast = timed(voting.parse_feed, content, args.repeat)
+        slow_ms, slow = timed(lambda c: feedparser_items(voting, c), content, args.repeat)
+
+        try:
+            fast_path = voting.parse_feed_fast(content) is not None
+        except voting.etree.XMLSyntaxError:
+            fast_path = False
+
+        print(
+            f"{os.path.basename(path)[:-4]:<20} {len(content) / 1024:>6.0f} "
+            f"{fast_ms:>8.2f} {slow_ms:>14.2f} {slow_ms / fast_ms:>7.1f}x "
+            f"{len(fast):>4}/{len(slow):<4} {mismatches(fast, slow, voting.summary_text):>5}"
+            + ("" if fast_path else "  (fell back to feedparser)")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import voting as voting_module  # noqa: E402
+
+
+@pytest.fixture
+def voting(tmp_path, monkeypatch):
+    """The app module, with relative database paths resolving into a temp dir."""
+    monkeypatch.chdir(tmp_path)
+    return voting_module
+
+
+@pytest.fixture
+def vote_pool(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "votes.db"))
+    voting.init_db(pool)
+    return pool
+
+
+@pytest.fixture
+def content_pool(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "content.db"))
+    voting.init_content_db(pool)
+    return pool
+
+
+@pytest.fixture
+def page_server():
+    """
+    Local HTTP server for fetch tests. Set ``server.pages[path] = (body, delay)``;
+    ``server.hits`` counts requests per path.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            body, delay = server.pages.get(self.path, (None, 0))
+            time.sleep(delay)
+
+            if body is None:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.pages = {}
+    server.hits = {}
+    server.url = lambda path: f"http://127.0.0.1:{server.server_address[1]}{path}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def make_vote(voting, article_id="a1", option_text="Yes", user_fingerprint="fp1"):
+    return voting.PendingVote(
+        article_id=article_id,
+        article_url=f"https://example.com/{article_id}",
+        article_title=article_id,
+        option_text=option_text,
+        user_fingerprint=user_fingerprint,
+        voted_at="2026-01-01T00:00:00",
+    )
+
+
+def read_tally(pool, article_id):
+    with pool.connection() as conn:
+        rows = conn.execute(
+            "SELECT option_text, vote_count FROM article_votes WHERE article_id = ?",
+            (article_id,),
+        ).fetchall()
+
+    return {row["option_text"]: row["vote_count"] for row in rows}
@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import as_completed
+
+import pytest
+
+
+@pytest.fixture
+def fetching(voting, content_pool, monkeypatch):
+    cache = voting.ArticleCache(content_pool)
+    fetcher = voting.AsyncFetcher()
+    monkeypatch.setattr(voting, "get_article_cache", lambda: cache)
+    monkeypatch.setattr(voting, "get_http_fetcher", lambda: fetcher)
+
+    yield cache
+
+    fetcher.close()
+
+
+def article(voting, text="", **fields):
+    return dict(voting.empty_article(), text=text, **fields)
+
+
+def test_cached_pages_are_ready_and_only_misses_are_fetched(voting, fetching, page_server):
+    cached, missing = page_server.url("/cached"), page_server.url("/missing")
+    page_server.pages["/missing"] = (b"<p>Fresh body</p>", 0)
+    fetching.put_many({cached: article(voting, "Cached body")})
+
+    articles, futures = voting.start_article_fetches([cached, missing, missing])
+
+    assert articles == {cached: article(voting, "Cached body")}
+    assert list(futures) == [missing]
+    assert futures[missing].result(timeout=10)["text"] == "Fresh body"
+    assert page_server.hits == {"/missing": 1}
+
+
+def test_fetches_complete_in_arrival_order(voting, fetching, page_server):
+    slow, fast = page_server.url("/slow"), page_server.url("/fast")
+    page_server.pages["/slow"] = (b"<p>Slow</p>", 0.5)
+    page_server.pages["/fast"] = (b"<p>Fast</p>", 0)
+
+    _, futures = voting.start_article_fetches([slow, fast])
+    urls = {future: url for url, future in futures.items()}
+
+    assert [urls[f] for f in as_completed(urls, timeout=10)] == [fast, slow]
+
+
+@pytest.mark.parametrize("url", ["http://127.0.0.1:1/unreachable", None])
+def test_failed_fetch_resolves_to_an_empty_article(voting, fetching, page_server, url):
+    # None: an error page, which must not be parsed as the article.
+    _, futures = voting.start_article_fetches([url or page_server.url("/gone")])
+
+    assert [f.result(timeout=10) for f in futures.values()] == [voting.empty_article()]
+
+
+def wait_for(check, timeout=10):
+    deadline = time.monotonic() + timeout
+
+    while not check():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_fetched_pages_record_themselves_in_the_cache(voting, fetching, page_server):
+    url = page_server.url("/story")
+    page_server.pages["/story"] = (b"<p>Once</p>", 0)
+
+    # Nobody waits on the future, as when a render's deadline has passed.
+    voting.start_article_fetches([url])
+    wait_for(lambda: url in fetching.get_many([url]))
+
+    articles, futures = voting.start_article_fetches([url])
+
+    assert futures == {}
+    assert articles[url]["text"] == "Once"
+    assert page_server.hits == {"/story": 1}
+
+
+def test_a_page_in_flight_is_not_fetched_again(voting, fetching, page_server):
+    url = page_server.url("/slow")
+    page_server.pages["/slow"] = (b"<p>Slow</p>", 0.3)
+
+    _, first = voting.start_article_fetches([url])
+    _, second = voting.start_article_fetches([url])
+
+    assert second[url] is first[url]
+    assert first[url].result(timeout=10)["text"] == "Slow"
+    wait_for(lambda: url in fetching.get_many([url]))
+    assert page_server.hits == {"/slow": 1}
@@ -0,0 +1,87 @@
+import pytest
+
+
+PAGE = b"""<html><head>
+<meta property="og:image" content="/img/lead.jpg">
+<link rel="canonical" href="https://example.com/news/story">
+<meta property="article:published_time" content="2026-01-01T12:00:00Z">
+</head><body>
+<img src="/img/logo.png">
+<p>First paragraph.</p><div>Navigation</div><p>Second <b>paragraph</b>.</p>
+</body></html>"""
+
+
+def test_parse_article_reads_text_and_metadata(voting):
+    article = voting.parse_article(PAGE, "https://example.com/news/story?utm_source=x")
+
+    assert article == {
+        "text": "First paragraph. Second paragraph.",
+        "image_url": "https://example.com/img/lead.jpg",
+        "canonical_url": "https://example.com/news/story",
+        "published_time": "2026-01-01T12:00:00Z",
+    }
+
+
+def test_parse_article_falls_back_to_the_first_image(voting):
+    article = voting.parse_article(b"<html><body><img src='a.png'><p>Hi</p></body></html>", "https://example.com/x/")
+
+    assert article["image_url"] == "https://example.com/x/a.png"
+    assert article["canonical_url"] is None
+    assert article["published_time"] is None
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM/a?b=2&a=1#top", "https://example.com/a?a=1&b=2"),
+    ("https://example.com/a?utm_source=x&id=7&fbclid=y", "https://example.com/a?id=7"),
+    ("https://example.com", "https://example.com/"),
+    ("  https://example.com/a  ", "https://example.com/a"),
+])
+def test_normalize_url(voting, url, expected):
+    assert voting.normalize_url(url) == expected
+
+
+@pytest.fixture
+def cache(voting, content_pool):
+    return voting.ArticleCache(content_pool)
+
+
+def article(voting, text="", **fields):
+    return dict(voting.empty_article(), text=text, **fields)
+
+
+def test_cache_round_trip_shares_normalized_urls(voting, cache):
+    cache.put_many({"https://example.com/a?utm_source=feed": article(voting, "Body")})
+
+    assert cache.get_many(["https://example.com/a", "https://example.com/b"]) == {
+        "https://example.com/a": article(voting, "Body"),
+    }
+
+
+def test_failed_fetches_expire_sooner(voting, cache, monkeypatch):
+    cache.put_many({
+        "https://example.com/ok": article(voting, "Body"),
+        "https://example.com/failed": article(voting),
+    })
+    later = voting.time.time() + voting.ARTICLE_CACHE_MISS_TTL + 1
+    monkeypatch.setattr(voting.time, "time", lambda: later)
+
+    assert list(cache.get_many(["https://example.com/ok", "https://example.com/failed"])) == ["https://example.com/ok"]
+
+
+def test_cache_evicts_least_recently_read_past_the_budget(voting, content_pool, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(voting.time, "time", lambda: clock[0])
+    cache = voting.ArticleCache(content_pool, max_bytes=150)
+
+    for n in range(2):
+        cache.put_many({f"https://example.com/{n}": article(voting, f"Body {n}")})
+        clock[0] += 100
+
+    cache.get_many(["https://example.com/0"])
+    clock[0] += 100
+    cache.put_many({"https://example.com/2": article(voting, "Body 2")})
+
+    assert sorted(cache.get_many([f"https://example.com/{n}" for n in range(3)])) == [
+        "https://example.com/0",
+        "https://example.com/2",
+    ]
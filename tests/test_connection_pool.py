@@ -0,0 +1,84 @@
+import sqlite3
+import threading
+
+import pytest
+
+
+class StuckConnection:
+    """Stands in for a connection whose transaction cannot be rolled back."""
+
+    in_transaction = True
+    closed = False
+
+    def rollback(self):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    def close(self):
+        self.closed = True
+
+
+def test_connections_are_reused(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "db.sqlite"), size=1)
+
+    with pool.connection() as first:
+        pass
+
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_open_transactions_are_rolled_back_on_return(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "db.sqlite"), size=1)
+
+    with pool.connection() as conn:
+        conn.execute("CREATE TABLE t (x)")
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("INSERT INTO t VALUES (1)")
+
+    with pool.connection() as conn:
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+
+
+def test_exhausted_pool_times_out(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "db.sqlite"), size=1, timeout=0.2)
+
+    with pool.connection():
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.connection():
+                pass
+
+
+def test_connection_that_will_not_roll_back_is_replaced(voting, tmp_path):
+    stuck = StuckConnection()
+
+    class Pool(voting.ConnectionPool):
+        opened = []
+
+        def connect(self):
+            conn = stuck if not self.opened else super().connect()
+            self.opened.append(conn)
+            return conn
+
+    pool = Pool(str(tmp_path / "db.sqlite"), size=1, timeout=5)
+    acquired = threading.Event()
+    result = {}
+
+    def waiter():
+        acquired.wait()
+
+        with pool.connection() as conn:
+            result["conn"] = conn
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+
+    with pool.connection() as conn:
+        assert conn is stuck
+        acquired.set()
+
+    thread.join(timeout=10)
+
+    assert stuck.closed
+    assert isinstance(result["conn"], sqlite3.Connection)
+    assert len(pool.opened) == 2
@@ -0,0 +1,59 @@
+import pytest
+
+
+@pytest.fixture
+def extract(voting):
+    return voting.CapitalizationEntityExtractor().extract
+
+
+def test_names_stop_at_the_end_of_a_sentence(extract):
+    counts = extract("It was Labour. Speaking in London, the leader said so.")
+
+    assert counts == {"Labour": 1, "London": 1}
+
+
+def test_words_that_only_open_sentences_are_dropped(extract):
+    counts = extract("However, the Bank of England held rates. After the vote, Labour said so.")
+
+    assert counts == {"Bank of England": 1, "Labour": 1}
+
+
+def test_a_name_seen_mid_sentence_counts_at_a_sentence_start_too(extract):
+    counts = extract("Starmer spoke first. Then Keir Starmer left, and Starmer returned.")
+
+    assert counts == {"Starmer": 2, "Keir Starmer": 1}
+
+
+def test_aliases_and_abbreviations(extract):
+    counts = extract("Talks between the U.S. and the EU, and the UK and Britain, went on.")
+
+    assert counts == {"United States": 1, "European Union": 1, "United Kingdom": 2}
+
+
+def test_batches_truncate_long_texts(voting):
+    text = "x " * voting.NER_MAX_CHARS + "and Paris"
+
+    assert voting.CapitalizationEntityExtractor().extract_batch([text, "in Paris"]) == [{}, {"Paris": 1}]
+
+
+class Stopped(Exception):
+    pass
+
+
+def stop():
+    raise Stopped()
+
+
+def test_unknown_extractor_name_is_reported(voting, monkeypatch):
+    errors = []
+    monkeypatch.setattr(voting.st, "error", errors.append)
+    monkeypatch.setattr(voting.st, "stop", stop)
+
+    with pytest.raises(Stopped):
+        voting.load_extractor("xl")
+
+    assert errors == ["Unknown entity extractor 'xl' in EKO_ENTITY_EXTRACTOR. Choose one of: sm, md, lg, rules"]
+
+
+def test_rules_extractor_loads_by_name(voting):
+    assert isinstance(voting.load_extractor("rules"), voting.CapitalizationEntityExtractor)
@@ -0,0 +1,62 @@
+import sqlite3
+import threading
+
+
+def test_failed_sweep_does_not_stop_the_ingestor(voting, tmp_path):
+    pool = voting.ConnectionPool(str(tmp_path / "content.db"))
+    voting.init_content_db(pool)
+
+    class FlakyIngestor(voting.FeedIngestor):
+        sweeps = 0
+        recovered = threading.Event()
+
+        def _prune(self):
+            self.sweeps += 1
+
+            if self.sweeps == 1:
+                raise sqlite3.OperationalError("database is locked")
+
+            self.recovered.set()
+
+    ingestor = FlakyIngestor(pool, {}, interval=3600)
+
+    while ingestor.sweeps == 0:
+        ingestor._thread.join(timeout=0.01)
+
+    ingestor._wake.set()
+
+    assert ingestor.recovered.wait(timeout=10)
+    assert ingestor._thread.is_alive()
+
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0">
+  <channel>
+    <title>Example</title>
+    <item>
+      <title>Long-running story</title>
+      <link>https://example.com/1</link>
+      <description>Still in the feed</description>
+    </item>
+  </channel>
+</rss>
+"""
+
+
+def test_prune_keeps_entries_the_feed_still_carries(voting, content_pool, page_server):
+    page_server.pages["/feed"] = (RSS, 0)
+    ingestor = voting.FeedIngestor(content_pool, {}, interval=3600)
+    ingestor.sources = {"Example": page_server.url("/feed")}
+
+    ingestor.poll("Example")
+
+    with content_pool.connection() as conn:
+        conn.execute("UPDATE feed_entries SET ingested_at = 0")
+
+    ingestor.poll("Example")
+    ingestor._prune()
+
+    with content_pool.connection() as conn:
+        kept = conn.execute("SELECT link FROM feed_entries").fetchall()
+
+    assert [row["link"] for row in kept] == ["https://example.com/1"]
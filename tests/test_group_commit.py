@@ -0,0 +1,61 @@
+import sqlite3
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+from conftest import make_vote, read_tally
+
+
+def commit_batch(voting, pool, votes):
+    writer = voting.VoteWriter(pool, voting.VoteTallyCache())
+    conn = writer._connect()
+    writer._commit(conn, votes)
+    return [vote.done.result(timeout=0) for vote in votes]
+
+
+def test_batch_commits_every_vote_in_one_transaction(voting, vote_pool):
+    votes = [make_vote(voting, option_text=option, user_fingerprint=f"fp{n}")
+             for n, option in enumerate(["Yes", "No", "Yes"])]
+
+    assert commit_batch(voting, vote_pool, votes) == [True, True, True]
+    assert read_tally(vote_pool, "a1") == {"Yes": 2, "No": 1}
+
+
+def test_duplicate_is_rolled_back_alone(voting, vote_pool):
+    votes = [
+        make_vote(voting, option_text="Yes", user_fingerprint="fp1"),
+        make_vote(voting, option_text="No", user_fingerprint="fp1"),
+        make_vote(voting, option_text="No", user_fingerprint="fp2"),
+    ]
+
+    assert commit_batch(voting, vote_pool, votes) == [True, False, True]
+    assert read_tally(vote_pool, "a1") == {"Yes": 1, "No": 1}
+
+    with vote_pool.connection() as conn:
+        logged = conn.execute("SELECT COUNT(*) FROM vote_changes").fetchone()[0]
+
+    assert logged == 2
+
+
+def test_duplicate_of_an_earlier_batch_is_rejected(voting, vote_pool):
+    commit_batch(voting, vote_pool, [make_vote(voting, user_fingerprint="fp1")])
+
+    assert commit_batch(voting, vote_pool, [make_vote(voting, option_text="No", user_fingerprint="fp1")]) == [False]
+    assert read_tally(vote_pool, "a1") == {"Yes": 1}
+
+
+@pytest.mark.parametrize("error", [
+    FutureTimeoutError(),
+    sqlite3.OperationalError("database is locked"),
+])
+def test_cast_vote_turns_write_failures_into_a_notice(voting, monkeypatch, error):
+    def failing_record_vote(**kwargs):
+        raise error
+
+    monkeypatch.setattr(voting, "record_vote", failing_record_vote)
+    voting.st.session_state[voting.poll_state_key("a1")] = "stale"
+
+    voting.cast_vote("a1", "https://example.com/a1", "a1", "Yes")
+
+    assert voting.st.session_state[voting.poll_notice_key("a1")] == "error"
+    assert voting.poll_state_key("a1") not in voting.st.session_state
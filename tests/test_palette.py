@@ -0,0 +1,15 @@
+from PIL import Image
+
+
+def test_rgb_to_hex_clamps_out_of_range_channels(voting):
+    assert voting.rgb_to_hex((256, 4, 4)) == "#ff0404"
+    assert voting.rgb_to_hex((-1, 0, 300)) == "#0000ff"
+
+
+def test_dominant_colors_stay_in_range(voting):
+    img = Image.new("RGB", (32, 32), (255, 255, 255))
+    img.paste((255, 0, 0), (0, 0, 16, 32))
+
+    for color in voting.get_dominant_colors(img):
+        assert all(0 <= c <= 255 for c in color)
+        assert len(voting.rgb_to_hex(color)) == 7
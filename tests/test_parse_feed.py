@@ -0,0 +1,128 @@
+import pytest
+
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"
+     xmlns:media="http://search.yahoo.com/mrss/"
+     xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Example</title>
+    <item>
+      <title> First story </title>
+      <link> https://example.com/1 </link>
+      <description>Plain summary</description>
+      <pubDate>Thu, 01 Jan 2026 12:00:00 GMT</pubDate>
+      <media:group>
+        <media:content url="https://example.com/video.mp4" type="video/mp4"/>
+        <media:content url="https://example.com/1.jpg" medium="image"/>
+      </media:group>
+    </item>
+    <item>
+      <title>Second story</title>
+      <link>https://example.com/2</link>
+      <description>No picture here</description>
+      <enclosure url="https://example.com/2.png" type="image/png" length="1"/>
+    </item>
+    <item>
+      <title>Third story</title>
+      <link>https://example.com/3</link>
+      <description><![CDATA[<p>Hi <img alt="" src="https://example.com/3.jpg?a=1&amp;b=2"></p>]]></description>
+      <pubDate>not a date</pubDate>
+    </item>
+  </channel>
+</rss>
+"""
+
+ATOM = b"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Example</title>
+  <entry>
+    <title type="html">Caf&amp;eacute; &lt;b&gt;news&lt;/b&gt;</title>
+    <link rel="self" href="https://example.com/self"/>
+    <link href="https://example.com/a1"/>
+    <link rel="enclosure" type="image/jpeg" href="https://example.com/a1.jpg"/>
+    <updated>2026-01-01T12:00:00+00:00</updated>
+    <summary>Atom summary</summary>
+  </entry>
+  <entry>
+    <title>Content only</title>
+    <link rel="alternate" href="https://example.com/a2"/>
+    <published>2026-01-02T00:00:00Z</published>
+    <content type="xhtml"><div xmlns="http://www.w3.org/1999/xhtml">Body <img src="https://example.com/a2.png"/></div></content>
+  </entry>
+</feed>
+"""
+
+RDF = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" xmlns="http://purl.org/rss/1.0/">
+  <channel rdf:about="https://example.com/"><title>Example</title></channel>
+  <item rdf:about="https://example.com/r1">
+    <title>RDF story</title>
+    <link>https://example.com/r1</link>
+    <description>RSS 1.0 summary</description>
+  </item>
+</rdf:RDF>
+"""
+
+
+def test_rss_items(voting):
+    items = voting.parse_feed_fast(RSS)
+
+    assert [i["link"] for i in items] == ["https://example.com/1", "https://example.com/2", "https://example.com/3"]
+    assert items[0]["title"] == "First story"
+    assert items[0]["summary"] == "Plain summary"
+    assert items[0]["published_ts"] == 1767268800.0
+    assert items[2]["published_ts"] is None
+
+
+def test_rss_images(voting):
+    images = [i["image_url"] for i in voting.parse_feed_fast(RSS)]
+
+    assert images == [
+        "https://example.com/1.jpg",            # media:group, skipping the video
+        "https://example.com/2.png",            # enclosure
+        "https://example.com/3.jpg?a=1&b=2",    # <img> inside CDATA, unescaped
+    ]
+
+
+def test_atom_entries(voting):
+    first, second = voting.parse_feed_fast(ATOM)
+
+    assert first["link"] == "https://example.com/a1"
+    assert first["title"] == "Café news"
+    assert first["summary"] == "Atom summary"
+    assert first["published_ts"] == 1767268800.0
+    assert first["image_url"] == "https://example.com/a1.jpg"
+
+    assert second["link"] == "https://example.com/a2"
+    assert "Body" in second["summary"]
+    assert second["published_ts"] == 1767312000.0
+    assert second["image_url"] == "https://example.com/a2.png"
+
+
+def test_other_feed_formats_are_left_to_feedparser(voting):
+    assert voting.parse_feed_fast(RDF) is None
+
+    items = voting.parse_feed(RDF)
+
+    assert [i["link"] for i in items] == ["https://example.com/r1"]
+    assert items[0]["summary"] == "RSS 1.0 summary"
+
+
+def test_malformed_xml(voting):
+    broken = RSS.replace(b"</channel>", b"")
+
+    with pytest.raises(voting.etree.XMLSyntaxError):
+        voting.parse_feed_fast(broken)
+
+    # feedparser is lenient enough to salvage the items.
+    assert [i["link"] for i in voting.parse_feed(broken)][:1] == ["https://example.com/1"]
+
+
+@pytest.mark.parametrize("feed", [RSS, ATOM])
+def test_fast_path_agrees_with_feedparser(voting, feed):
+    fast = voting.parse_feed_fast(feed)
+    slow = voting.feedparser.parse(feed).entries
+
+    assert [i["link"] for i in fast] == [e.get("link") for e in slow]
+    assert [voting.summary_text(i["title"]) for i in fast] == [voting.summary_text(e.get("title")) for e in slow]
@@ -0,0 +1,79 @@
+from collections import Counter
+
+import pytest
+
+
+@pytest.fixture
+def options_db(voting, vote_pool, monkeypatch):
+    cache = voting.BoundedCache(100)
+    monkeypatch.setattr(voting, "get_db_pool", lambda: vote_pool)
+    monkeypatch.setattr(voting, "get_options_cache", lambda: cache)
+    return vote_pool
+
+
+def entry(voting, article_id, title="Quiet news"):
+    return voting.FeedEntry(
+        entry_id=article_id,
+        source="Example",
+        link=f"https://example.com/{article_id}",
+        title=title,
+        summary="",
+        published_ts=None,
+        image_url=None,
+    )
+
+
+def test_saved_options_load_back(voting, options_db):
+    voting.save_poll_options({"a1": ["Alice", "Bob"]})
+
+    assert voting.load_poll_options(["a1", "a2"]) == {"a1": ["Alice", "Bob"]}
+
+
+def test_first_writer_wins(voting, options_db):
+    assert voting.save_poll_options({"a1": ["Alice", "Bob"]}) == {"a1": ["Alice", "Bob"]}
+    assert voting.save_poll_options({"a1": ["Carol"], "a2": ["Dan"]}) == {"a1": ["Alice", "Bob"], "a2": ["Dan"]}
+    assert voting.load_poll_options(["a1", "a2"]) == {"a1": ["Alice", "Bob"], "a2": ["Dan"]}
+
+
+def test_first_writer_wins_across_processes(voting, options_db, monkeypatch):
+    voting.save_poll_options({"a1": ["Alice"]})
+
+    # Another process: same database, its own empty options cache.
+    cache = voting.BoundedCache(100)
+    monkeypatch.setattr(voting, "get_options_cache", lambda: cache)
+
+    assert voting.save_poll_options({"a1": ["Carol"]}) == {"a1": ["Alice"]}
+
+
+def test_stored_options_are_cached(voting, options_db):
+    voting.save_poll_options({"a1": ["Alice"]})
+
+    with options_db.connection() as conn:
+        conn.execute("DELETE FROM poll_options")
+
+    assert voting.load_poll_options(["a1"]) == {"a1": ["Alice"]}
+
+
+def test_compute_options_batch_persists_everything_it_returns(voting, options_db, monkeypatch):
+    monkeypatch.setattr(voting, "extract_entities_batch", lambda texts: [Counter(t.split()) for t in texts])
+    entries = [entry(voting, "a1", "Election results are in"), entry(voting, "a2"), entry(voting, "a3")]
+
+    options = voting.compute_options_batch(entries, ["", "Alice Alice Bob", ""])
+
+    assert options == {
+        "a1": ["Yes", "No", "Not sure"],
+        "a2": ["Alice", "Bob"],
+        "a3": ["Support", "Oppose", "Neutral"],
+    }
+    assert voting.load_poll_options(["a1", "a2", "a3"]) == options
+
+
+def test_options_shown_once_never_change(voting, options_db, monkeypatch):
+    # A page that failed to load first gets the default options; when it
+    # loads later, the buttons people may have voted on stay.
+    monkeypatch.setattr(voting, "extract_entities_batch", lambda texts: [Counter(t.split()) for t in texts])
+
+    first = voting.compute_options_batch([entry(voting, "a1")], [""])
+    later = voting.compute_options_batch([entry(voting, "a1")], ["Alice Bob"])
+
+    assert first == later == {"a1": ["Support", "Oppose", "Neutral"]}
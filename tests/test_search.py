@@ -0,0 +1,93 @@
+import time
+
+import pytest
+
+
+@pytest.fixture
+def search(voting, content_pool, monkeypatch):
+    monkeypatch.setattr(voting, "get_content_pool", lambda: content_pool)
+    return lambda text, sources=("BBC",): [e.entry_id for e in voting.search_entries(text, sources)]
+
+
+def store_entry(pool, entry_id, title, summary="", source="BBC", ingested_at=None):
+    with pool.connection() as conn:
+        conn.execute("""
+            INSERT INTO feed_entries (entry_id, source, link, title, summary, ingested_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(entry_id) DO UPDATE SET title = excluded.title, summary = excluded.summary
+        """, (entry_id, source, f"https://example.com/{entry_id}", title, summary,
+              time.time() if ingested_at is None else ingested_at))
+
+
+@pytest.mark.parametrize("text, query", [
+    ("Election", '"election"*'),
+    ("elect res", '"elect"* AND "res"*'),
+    ("  \"quoted\" -- ", '"quoted"*'),
+    ("?!", None),
+])
+def test_search_query(voting, text, query):
+    assert voting.search_query(text) == query
+
+
+def test_every_word_matches_as_a_prefix(content_pool, search):
+    store_entry(content_pool, "e1", "Election results")
+    store_entry(content_pool, "e2", "Election night")
+
+    assert search("elect res") == ["e1"]
+    assert sorted(search("ELECTION")) == ["e1", "e2"]
+
+
+def test_index_follows_inserts_updates_and_prunes(voting, content_pool, search):
+    store_entry(content_pool, "e1", "Storm warning")
+    assert search("storm") == ["e1"]
+
+    store_entry(content_pool, "e1", "Heatwave warning")
+    assert search("storm") == []
+    assert search("heatwave") == ["e1"]
+
+    store_entry(content_pool, "e2", "Heatwave ends", ingested_at=0)
+    assert sorted(search("heatwave")) == ["e1", "e2"]
+
+    ingestor = voting.FeedIngestor(content_pool, {}, interval=3600)
+    ingestor._prune()
+
+    assert search("heatwave") == ["e1"]
+
+    with content_pool.connection() as conn:
+        indexed = conn.execute("SELECT COUNT(*) FROM entry_search").fetchone()[0]
+
+    assert indexed == 1
+
+
+def test_titles_outrank_summaries_and_bodies(voting, content_pool, search):
+    store_entry(content_pool, "body", "Weekend sport")
+    store_entry(content_pool, "summary", "Markets close", summary="Budget reaction")
+    store_entry(content_pool, "title", "Budget announced")
+
+    voting.ArticleCache(content_pool).put_many({
+        "https://example.com/body": dict(voting.empty_article(), text="Nothing about the budget here."),
+    })
+
+    assert search("budget") == ["title", "summary", "body"]
+
+
+def test_only_requested_sources_are_searched(content_pool, search):
+    store_entry(content_pool, "bbc", "Flood defences", source="BBC")
+    store_entry(content_pool, "cnn", "Flood defences", source="CNN")
+
+    assert search("flood", ["CNN"]) == ["cnn"]
+
+
+def test_existing_entries_are_indexed_once(voting, content_pool, search):
+    with content_pool.connection() as conn:
+        conn.execute("DROP TABLE entry_search")
+
+        for trigger in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER feed_entries_search_{trigger}")
+
+    store_entry(content_pool, "old", "Harbour reopens")
+
+    voting.init_content_db(content_pool)
+    voting.init_content_db(content_pool)
+
+    assert search("harbour") == ["old"]
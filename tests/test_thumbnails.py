@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+
+
+async def fetch_from_chunked_server(voting, body):
+    async def image(request):
+        # Chunked, so there is no Content-Length to check up front.
+        resp = web.StreamResponse()
+        resp.enable_chunked_encoding()
+        await resp.prepare(request)
+        await resp.write(body)
+        return resp
+
+    app = web.Application()
+    app.router.add_get("/image", image)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            return await voting.fetch_thumbnail_async(session, f"http://127.0.0.1:{port}/image")
+    finally:
+        await runner.cleanup()
+
+
+def test_source_over_the_cap_is_rejected_without_content_length(voting, monkeypatch):
+    written = []
+    monkeypatch.setattr(voting, "THUMB_MAX_SOURCE_BYTES", 1024)
+    monkeypatch.setattr(voting, "write_thumbnail", written.append)
+
+    assert asyncio.run(fetch_from_chunked_server(voting, b"x" * 1025)) is None
+    assert written == []
+
+
+def test_source_at_the_cap_is_read_in_full(voting, monkeypatch):
+    written = []
+    monkeypatch.setattr(voting, "THUMB_MAX_SOURCE_BYTES", 1024)
+    monkeypatch.setattr(voting, "write_thumbnail", lambda data: written.append(bytes(data)))
+
+    asyncio.run(fetch_from_chunked_server(voting, b"x" * 1024))
+
+    assert written == [b"x" * 1024]
+
+
+class RecordingCache:
+    def __init__(self):
+        self.recorded = []
+
+    def get_many(self, urls):
+        return {}
+
+    def put_many(self, results):
+        self.recorded.append(results)
+
+
+def test_thumbnail_fetches_record_themselves_once(voting, monkeypatch):
+    cache = RecordingCache()
+    fetcher = voting.AsyncFetcher()
+    calls = []
+
+    async def fake_fetch(session, url):
+        calls.append(url)
+        await asyncio.sleep(0.2)
+        return "thumb"
+
+    monkeypatch.setattr(voting, "get_thumbnail_cache", lambda: cache)
+    monkeypatch.setattr(voting, "get_http_fetcher", lambda: fetcher)
+    monkeypatch.setattr(voting, "fetch_thumbnail_async", fake_fetch)
+
+    try:
+        _, first = voting.start_thumbnail_fetches(["https://example.com/a.jpg"])
+        _, second = voting.start_thumbnail_fetches(["https://example.com/a.jpg"])
+
+        assert second == first
+        assert first["https://example.com/a.jpg"].result(timeout=10) == "thumb"
+
+        deadline = time.monotonic() + 10
+        while not cache.recorded and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        fetcher.close()
+
+    assert calls == ["https://example.com/a.jpg"]
+    assert cache.recorded == [{"https://example.com/a.jpg": "thumb"}]
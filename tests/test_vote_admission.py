@@ -0,0 +1,169 @@
+import pytest
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(voting, monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(voting.time, "monotonic", clock)
+    return clock
+
+
+def allow(limiter, key):
+    if not limiter.ready(key):
+        return False
+
+    limiter.take(key)
+    return True
+
+
+def test_ready_does_not_spend(voting, clock):
+    limiter = voting.TokenBucketLimiter(rate=0, burst=1)
+
+    assert limiter.ready("k") is True
+    assert limiter.ready("k") is True
+
+    limiter.take("k")
+    assert limiter.ready("k") is False
+
+
+def test_bucket_allows_a_burst_then_refills(voting, clock):
+    limiter = voting.TokenBucketLimiter(rate=0.5, burst=3)
+
+    assert [allow(limiter, "k") for _ in range(4)] == [True, True, True, False]
+
+    clock.now += 1
+    assert allow(limiter, "k") is False
+
+    clock.now += 1
+    assert allow(limiter, "k") is True
+    assert allow(limiter, "k") is False
+
+
+def test_bucket_never_refills_past_the_burst(voting, clock):
+    limiter = voting.TokenBucketLimiter(rate=1, burst=2)
+    allow(limiter, "k")
+
+    clock.now += 3600
+    assert [allow(limiter, "k") for _ in range(3)] == [True, True, False]
+
+
+def test_buckets_are_per_key(voting, clock):
+    limiter = voting.TokenBucketLimiter(rate=0, burst=1)
+
+    assert allow(limiter, "a") is True
+    assert allow(limiter, "a") is False
+    assert allow(limiter, "b") is True
+
+
+def test_least_recently_used_keys_are_forgotten(voting, clock):
+    limiter = voting.TokenBucketLimiter(rate=0, burst=1, max_keys=2)
+
+    allow(limiter, "a")
+    allow(limiter, "b")
+    allow(limiter, "c")
+
+    assert allow(limiter, "a") is True
+    assert allow(limiter, "c") is False
+
+
+class IdleWriter:
+    def __init__(self, depth=0):
+        self._depth = depth
+
+    def depth(self):
+        return self._depth
+
+
+@pytest.fixture
+def limiters(voting, monkeypatch, clock):
+    limiters = (
+        voting.TokenBucketLimiter(rate=0, burst=2),
+        voting.TokenBucketLimiter(rate=0, burst=3),
+    )
+    monkeypatch.setattr(voting, "get_vote_limiters", lambda: limiters)
+    monkeypatch.setattr(voting, "get_vote_writers", lambda: [IdleWriter(), IdleWriter()])
+    return limiters
+
+
+def admit(voting, fingerprint, ip):
+    try:
+        voting.admit_vote(fingerprint, ip)
+    except voting.VoteRejected as exc:
+        return exc.reason
+
+    return "admitted"
+
+
+def test_admit_vote_limits_each_fingerprint(voting, limiters):
+    results = [admit(voting, "fp1", "10.0.0.1") for _ in range(3)]
+
+    assert results == ["admitted", "admitted", "limited"]
+    assert admit(voting, "fp2", "10.0.0.2") == "admitted"
+
+
+def test_admit_vote_limits_each_ip_across_fingerprints(voting, limiters):
+    results = [admit(voting, f"fp{n}", "10.0.0.1") for n in range(4)]
+
+    assert results == ["admitted", "admitted", "admitted", "limited"]
+    assert admit(voting, "fp9", "10.0.0.2") == "admitted"
+
+
+def test_unknown_ips_are_limited_per_fingerprint_only(voting, limiters):
+    results = [admit(voting, f"fp{n}", "unknown_ip") for n in range(10)]
+
+    assert results == ["admitted"] * 10
+    assert [admit(voting, "fp0", "unknown_ip") for _ in range(2)] == ["admitted", "limited"]
+
+
+def test_a_vote_refused_by_one_bucket_spends_from_neither(voting, limiters):
+    by_fingerprint, by_ip = limiters
+
+    for _ in range(2):
+        admit(voting, "fp1", "10.0.0.1")
+
+    assert admit(voting, "fp1", "10.0.0.1") == "limited"
+    assert allow(by_ip, "10.0.0.1") is True
+    assert allow(by_ip, "10.0.0.1") is False
+
+    assert admit(voting, "fp2", "10.0.0.1") == "limited"
+    assert allow(by_fingerprint, "fp2") is True
+
+
+def test_admit_vote_refuses_when_the_queues_are_backed_up(voting, limiters, monkeypatch):
+    high = voting.VOTE_QUEUE_HIGH_WATER
+    monkeypatch.setattr(voting, "get_vote_writers", lambda: [IdleWriter(high // 2), IdleWriter(high - high // 2)])
+
+    assert admit(voting, "fp1", "10.0.0.1") == "busy"
+
+
+def test_request_headers_fall_back_to_the_websocket_helper(voting, monkeypatch):
+    from streamlit.web.server import websocket_headers
+
+    monkeypatch.delattr(voting.st, "context", raising=False)
+    monkeypatch.setattr(websocket_headers, "_get_websocket_headers", lambda: {"X-Real-IP": "203.0.113.7"})
+
+    assert voting.get_client_ip() == "203.0.113.7"
+
+
+@pytest.mark.parametrize("hops, expected", [(1, "10.0.0.1"), (2, "198.51.100.2"), (5, "203.0.113.7")])
+def test_client_ip_is_the_entry_added_by_a_trusted_proxy(voting, monkeypatch, hops, expected):
+    # The client wrote the first entry itself; each proxy appended one.
+    headers = {"X-Forwarded-For": "203.0.113.7, 198.51.100.2, 10.0.0.1", "X-Real-IP": "192.0.2.9"}
+    monkeypatch.setattr(voting, "get_request_headers", lambda: headers)
+    monkeypatch.setattr(voting, "TRUSTED_PROXY_HOPS", hops)
+
+    assert voting.get_client_ip() == expected
+
+
+def test_client_ip_is_unknown_outside_a_session(voting, monkeypatch):
+    monkeypatch.delattr(voting.st, "context", raising=False)
+
+    assert voting.get_client_ip() == "unknown_ip"
@@ -0,0 +1,99 @@
+from conftest import make_vote
+
+
+def make_shards(voting, tmp_path, count=2):
+    shards = [voting.ConnectionPool(str(tmp_path / f"shard{i}.db")) for i in range(count)]
+
+    for shard in shards:
+        voting.init_db(shard)
+
+    return shards
+
+
+def vote(voting, shard, article_id, fingerprint):
+    writer = voting.VoteWriter(shard, voting.VoteTallyCache())
+    assert writer.submit(make_vote(voting, article_id=article_id, user_fingerprint=fingerprint)).result(timeout=10)
+
+
+def test_changes_since_reports_only_newer_changes(voting, tmp_path):
+    shards = make_shards(voting, tmp_path)
+    feed = voting.VoteChangeFeed(shards, voting.VoteTallyCache(), interval=0)
+    start = feed.cursor()
+
+    vote(voting, shards[0], "a1", "fp1")
+    vote(voting, shards[1], "a2", "fp2")
+    middle, changed = feed.changes_since(start)
+
+    assert middle == (1, 1)
+    assert changed == {"a1", "a2"}
+
+    vote(voting, shards[1], "a3", "fp3")
+    latest, changed = feed.changes_since(middle)
+
+    assert latest == (1, 2)
+    assert changed == {"a3"}
+    assert feed.changes_since(latest) == (latest, set())
+
+
+def test_changes_since_respects_each_shards_cursor(voting, tmp_path):
+    shards = make_shards(voting, tmp_path)
+    feed = voting.VoteChangeFeed(shards, voting.VoteTallyCache(), interval=0)
+
+    vote(voting, shards[0], "a1", "fp1")
+    vote(voting, shards[1], "a2", "fp2")
+    vote(voting, shards[0], "a3", "fp3")
+
+    _, changed = feed.changes_since((1, 0))
+
+    assert changed == {"a2", "a3"}
+
+
+def test_cursor_below_the_floor_needs_a_full_reload(voting, tmp_path):
+    shards = make_shards(voting, tmp_path, count=1)
+    feed = voting.VoteChangeFeed(shards, voting.VoteTallyCache(), interval=0, buffer=2)
+
+    for n in range(4):
+        vote(voting, shards[0], f"a{n}", f"fp{n}")
+
+    latest, changed = feed.changes_since((0,))
+
+    assert latest == (4,)
+    assert changed is None
+    assert feed.changes_since((2,)) == (latest, {"a2", "a3"})
+
+
+def test_cursor_from_another_shard_layout_needs_a_full_reload(voting, tmp_path):
+    feed = voting.VoteChangeFeed(make_shards(voting, tmp_path), voting.VoteTallyCache(), interval=0)
+
+    assert feed.changes_since((0,))[1] is None
+
+
+def test_refresh_drops_changed_articles_from_the_tally_cache(voting, tmp_path):
+    shards = make_shards(voting, tmp_path, count=1)
+    cache = voting.VoteTallyCache()
+    feed = voting.VoteChangeFeed(shards, cache, interval=0)
+
+    _, token = cache.get_many(["a1"])
+    cache.fill({"a1": {}}, token)
+    vote(voting, shards[0], "a1", "fp1")
+    feed.changes_since(feed.cursor())
+
+    assert cache.get_many(["a1"])[0] == {}
+
+
+def test_tallies_are_dropped_before_the_cursor_moves(voting, tmp_path):
+    shards = make_shards(voting, tmp_path, count=1)
+
+    class WatchingCache(voting.VoteTallyCache):
+        cursors = []
+
+        def invalidate(self, article_ids):
+            self.cursors.append(feed.cursor())
+            super().invalidate(article_ids)
+
+    cache = WatchingCache()
+    feed = voting.VoteChangeFeed(shards, cache, interval=0)
+    vote(voting, shards[0], "a1", "fp1")
+
+    assert feed.changes_since((0,)) == ((1,), {"a1"})
+    assert cache.cursors == [(0,)]
@@ -0,0 +1,95 @@
+import pytest
+
+from conftest import make_vote
+
+
+def legacy_votes(pool, rows):
+    with pool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.executemany("""
+            INSERT INTO user_votes (article_id, user_fingerprint, option_text, voted_at)
+            VALUES (?, ?, ?, '2025-01-01T00:00:00')
+        """, rows)
+        conn.commit()
+
+
+def user_votes(pool):
+    with pool.connection() as conn:
+        return sorted(tuple(row) for row in conn.execute(
+            "SELECT article_id, user_fingerprint, option_text FROM user_votes"
+        ))
+
+
+def test_legacy_votes_move_to_their_shards_once(voting, vote_pool):
+    rows = [("a1", f"fp{n}", "Yes") for n in range(20)]
+    legacy_votes(vote_pool, rows)
+
+    shards = voting.open_vote_shards(vote_pool, default_count=3)
+
+    assert user_votes(vote_pool) == []
+
+    for index, shard in enumerate(shards):
+        assert user_votes(shard) == sorted(r for r in rows if voting.shard_index(r[1], 3) == index)
+
+    # A legacy row appearing later is not swept up by a second start.
+    legacy_votes(vote_pool, [("a2", "fp0", "No")])
+    shards = voting.open_vote_shards(vote_pool, default_count=3)
+
+    assert sum(len(user_votes(shard)) for shard in shards) == len(rows)
+    assert user_votes(vote_pool) == [("a2", "fp0", "No")]
+
+
+def test_shard_count_is_fixed_on_first_open(voting, vote_pool):
+    assert len(voting.open_vote_shards(vote_pool, default_count=3)) == 3
+    assert len(voting.open_vote_shards(vote_pool, default_count=8)) == 3
+
+
+def test_shard_index_is_stable_and_in_range(voting):
+    assert voting.shard_index("fp1", 4) == voting.shard_index("fp1", 4)
+    assert {voting.shard_index(f"fp{n}", 4) for n in range(200)} == {0, 1, 2, 3}
+
+
+@pytest.fixture
+def sharded(voting, vote_pool, monkeypatch):
+    shards = voting.open_vote_shards(vote_pool, default_count=2)
+    cache = voting.VoteTallyCache()
+    writers = [voting.VoteWriter(shard, cache) for shard in shards]
+
+    monkeypatch.setattr(voting, "get_db_pool", lambda: vote_pool)
+    monkeypatch.setattr(voting, "get_vote_shards", lambda: shards)
+    monkeypatch.setattr(voting, "get_tally_cache", lambda: cache)
+    monkeypatch.setattr(voting, "get_vote_writers", lambda: writers)
+    monkeypatch.setattr(voting, "admit_vote", lambda fingerprint, ip: None)
+    monkeypatch.setattr(voting, "get_client_ip", lambda: "10.0.0.1")
+    return shards, writers
+
+
+def test_record_vote_lands_in_the_users_shard(voting, sharded, monkeypatch):
+    shards, _ = sharded
+    monkeypatch.setattr(voting, "get_user_fingerprint", lambda: "fp7")
+
+    assert voting.record_vote("a1", "https://example.com/a1", "a1", "Yes") is True
+    assert voting.record_vote("a1", "https://example.com/a1", "a1", "No") is False
+
+    home = voting.shard_index("fp7", len(shards))
+
+    for index, shard in enumerate(shards):
+        assert user_votes(shard) == ([("a1", "fp7", "Yes")] if index == home else [])
+
+
+def test_tallies_add_shards_to_the_legacy_totals(voting, vote_pool, sharded):
+    shards, writers = sharded
+
+    with vote_pool.connection() as conn:
+        conn.execute("""
+            INSERT INTO article_votes (article_id, article_url, article_title, option_text, vote_count)
+            VALUES ('a1', 'https://example.com/a1', 'a1', 'Yes', 10)
+        """)
+
+    for n in range(6):
+        fingerprint = f"fp{n}"
+        writer = writers[voting.shard_index(fingerprint, len(writers))]
+        option = "Yes" if n % 2 else "No"
+        writer.submit(make_vote(voting, option_text=option, user_fingerprint=fingerprint)).result(timeout=10)
+
+    assert voting.load_vote_tallies(["a1", "a2"]) == {"a1": {"Yes": 13, "No": 3}, "a2": {}}
@@ -0,0 +1,45 @@
+from conftest import make_vote, read_tally
+
+
+def test_fill_is_dropped_when_a_write_started_after_the_read(voting):
+    cache = voting.VoteTallyCache()
+
+    _, token = cache.get_many(["a1"])
+    cache.invalidate(["a1"])
+    cache.fill({"a1": {"Yes": 1}}, token)
+
+    assert cache.get_many(["a1"])[0] == {}
+
+
+def test_fill_is_kept_without_concurrent_writes(voting):
+    cache = voting.VoteTallyCache()
+
+    _, token = cache.get_many(["a1"])
+    cache.fill({"a1": {"Yes": 3}}, token)
+
+    assert cache.get_many(["a1"])[0] == {"a1": {"Yes": 3}}
+
+
+def test_read_racing_a_commit_is_never_counted_twice(voting, vote_pool):
+    class RacingCache(voting.VoteTallyCache):
+        """Lets a reader run between the commit and the writer's last invalidation."""
+
+        calls = 0
+
+        def invalidate(self, article_ids):
+            self.calls += 1
+
+            if self.calls == 2:
+                _, token = self.get_many(["a1"])
+                self.fill({"a1": read_tally(vote_pool, "a1")}, token)
+
+            super().invalidate(article_ids)
+
+    cache = RacingCache()
+    writer = voting.VoteWriter(vote_pool, cache)
+
+    assert writer.submit(make_vote(voting)).result(timeout=10) is True
+
+    cached = cache.get_many(["a1"])[0].get("a1")
+    assert cached in (None, read_tally(vote_pool, "a1"))
+    assert read_tally(vote_pool, "a1") == {"Yes": 1}
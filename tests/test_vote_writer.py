@@ -0,0 +1,84 @@
+import sqlite3
+
+import pytest
+
+from conftest import make_vote, read_tally
+
+
+def test_writer_survives_a_failed_batch(voting, vote_pool):
+    class FlakyWriter(voting.VoteWriter):
+        failures = 1
+
+        def _commit(self, conn, batch):
+            if self.failures:
+                self.failures -= 1
+                raise sqlite3.OperationalError("database is locked")
+
+            super()._commit(conn, batch)
+
+    writer = FlakyWriter(vote_pool, voting.VoteTallyCache())
+
+    with pytest.raises(sqlite3.OperationalError):
+        writer.submit(make_vote(voting, user_fingerprint="fp1")).result(timeout=10)
+
+    assert writer.submit(make_vote(voting, user_fingerprint="fp2")).result(timeout=10) is True
+    assert read_tally(vote_pool, "a1") == {"Yes": 1}
+
+
+def test_failed_prune_does_not_stop_the_writer(voting, vote_pool, monkeypatch):
+    writer = voting.VoteWriter(vote_pool, voting.VoteTallyCache())
+    class Unbindable:
+        """Makes the prune's cutoff a value SQLite refuses to bind."""
+
+        def __rsub__(self, other):
+            return object()
+
+    monkeypatch.setattr(voting, "VOTE_CHANGE_RETENTION", Unbindable())
+
+    assert writer.submit(make_vote(voting, user_fingerprint="fp1")).result(timeout=10) is True
+
+    # The first batch also ran the (failing) hourly prune.
+    assert writer.submit(make_vote(voting, user_fingerprint="fp2")).result(timeout=10) is True
+    assert read_tally(vote_pool, "a1") == {"Yes": 2}
+
+
+def test_writer_reconnects_after_a_connection_level_error(voting, vote_pool):
+    class BrokenConnectionWriter(voting.VoteWriter):
+        connections = []
+
+        def _connect(self):
+            conn = super()._connect()
+            self.connections.append(conn)
+            return conn
+
+        def _commit(self, conn, batch):
+            if len(self.connections) == 1:
+                conn.close()
+
+            super()._commit(conn, batch)
+
+    writer = BrokenConnectionWriter(vote_pool, voting.VoteTallyCache())
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        writer.submit(make_vote(voting, user_fingerprint="fp1")).result(timeout=10)
+
+    assert writer.submit(make_vote(voting, user_fingerprint="fp2")).result(timeout=10) is True
+    assert len(writer.connections) == 2
+    assert read_tally(vote_pool, "a1") == {"Yes": 1}
+
+
+def test_failed_batch_leaves_no_transaction_open(voting, vote_pool):
+    class FailMidBatch(voting.VoteWriter):
+        def _commit(self, conn, batch):
+            batch[-1].option_text = object()    # fails to bind after BEGIN
+            super()._commit(conn, batch)
+
+    writer = FailMidBatch(vote_pool, voting.VoteTallyCache())
+
+    with pytest.raises(sqlite3.Error):
+        writer.submit(make_vote(voting)).result(timeout=10)
+
+    # The writer's lock is released, so other connections can write.
+    with vote_pool.connection() as conn:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.rollback()
@@ -9,14 +9,29 @@ import hashlib
 import time
 from streamlit_cookies_controller import CookieController
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from PIL import Image
 import random
 from colorthief import ColorThief
 from io import BytesIO
 import sqlite3
 import html
-from urllib.parse import quote
+import os
+import re
+import atexit
+import calendar
+import zlib
+import queue
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from email.utils import mktime_tz, parsedate_tz
+from urllib.parse import quote, urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+import lxml.html
+from lxml import etree
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -35,18 +50,123 @@ controller = CookieController()
 # SQLite database
 # ─────────────────────────────────────────────────────────────────
 DB_PATH = "eko_votes.db"
+DB_POOL_SIZE = 8
+DB_POOL_TIMEOUT = 30     # seconds to wait for a free connection
+
+# Applied to every pooled connection. WAL lets readers run alongside the
+# single writer; NORMAL sync is safe under WAL and avoids an fsync per commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA busy_timeout = 5000",
+)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of long-lived SQLite connections.
 
+    Connections are opened lazily up to ``size`` and handed out one thread at a
+    time. They run in autocommit mode, so write paths open their own
+    transactions with ``BEGIN IMMEDIATE``, and each keeps a prepared statement
+    cache so repeated queries skip SQL parsing.
+    """
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+    def __init__(self, path, size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def connect(self):
+        """Open a connection with the pool's settings that the pool does not manage."""
+        conn = sqlite3.connect(
+            self.path,
+            timeout=5,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.row_factory = sqlite3.Row
+
+        for pragma in SQLITE_PRAGMAS:
+            conn.execute(pragma)
+
+        return conn
+
+    def _acquire(self):
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                if self._opened < self.size:
+                    self._opened += 1
+                    try:
+                        return self.connect()
+                    except Exception:
+                        self._opened -= 1
+                        raise
+
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                raise sqlite3.OperationalError(f"no free connection to {self.path} after {self.timeout}s")
+
+            # Wake up now and then: a dropped connection frees a slot
+            # without putting anything in the queue.
+            try:
+                return self._idle.get(timeout=min(remaining, 1))
+            except queue.Empty:
+                pass
+
+    def _release(self, conn):
+        # Never hand a half-finished transaction to the next borrower. A
+        # connection that will not roll back is dropped and its slot freed.
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+            with self._lock:
+                self._opened -= 1
+            return
+
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self._acquire()
 
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+
+def ensure_column(cur, table, column, decl):
+    """Add ``column`` to a table created by an older version of the app."""
+    columns = {row["name"] for row in cur.execute(f"PRAGMA table_info({table})")}
+
+    if column not in columns:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
 
-def init_db():
-    conn = get_db_connection()
-    cur = conn.cursor()
 
+def init_vote_tables(cur):
+    """Vote tables; the same schema lives in the main database and every shard."""
     cur.execute("""
         CREATE TABLE IF NOT EXISTS article_votes (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -70,11 +190,132 @@ def init_db():
         )
     """)
 
-    conn.commit()
-    conn.close()
+    # Append-only log of recorded votes; seq orders the changes within a file.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS vote_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            article_id TEXT NOT NULL,
+            option_text TEXT NOT NULL,
+            changed_at REAL NOT NULL
+        )
+    """)
+
+
+def init_db(pool):
+    with pool.connection() as conn:
+        cur = conn.cursor()
+
+        init_vote_tables(cur)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS vote_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS poll_options (
+                article_id TEXT PRIMARY KEY,
+                options TEXT NOT NULL,
+                created_at TEXT NOT NULL
+            )
+        """)
+
+
+@st.cache_resource(show_spinner=False)
+def get_db_pool():
+    """One pool per process, shared by every Streamlit session."""
+    pool = ConnectionPool(DB_PATH)
+    init_db(pool)
+    return pool
+
+
+def get_db_connection():
+    """Borrow a pooled connection: ``with get_db_connection() as conn: ...``"""
+    return get_db_pool().connection()
+
 
+# Votes are spread over shard files by user fingerprint. Each file has its own
+# write lock, so worker processes recording votes for different users, even
+# on the same hot article, no longer queue behind one database-wide lock. A
+# user always lands in the same shard, so one-vote-per-article still holds.
+VOTE_SHARDS = 4
+VOTE_SHARD_POOL_SIZE = 4
 
-init_db()
+
+def vote_shard_path(index):
+    root, ext = os.path.splitext(DB_PATH)
+    return f"{root}.shard{index}{ext}"
+
+
+def shard_index(user_fingerprint, shard_count):
+    # A stable hash: every process must route a user to the same shard.
+    return int(hashlib.sha1(user_fingerprint.encode()).hexdigest()[:8], 16) % shard_count
+
+
+def open_vote_shards(pool, default_count=VOTE_SHARDS):
+    """
+    Open the vote shards recorded for this database, creating them on first use.
+
+    The shard count is fixed in ``vote_meta`` the first time, since changing
+    it would send users to a shard without their earlier votes. Per-user
+    votes from before sharding are moved into their shards once; the old
+    per-option totals stay in the main database as the base every read adds to.
+    """
+    with pool.connection() as conn:
+        conn.execute(
+            "INSERT OR IGNORE INTO vote_meta (key, value) VALUES ('shard_count', ?)",
+            (str(default_count),),
+        )
+        count = int(conn.execute("SELECT value FROM vote_meta WHERE key = 'shard_count'").fetchone()["value"])
+        migrated = conn.execute("SELECT 1 FROM vote_meta WHERE key = 'user_votes_sharded'").fetchone()
+
+    shards = [ConnectionPool(vote_shard_path(i), VOTE_SHARD_POOL_SIZE) for i in range(count)]
+
+    for shard in shards:
+        with shard.connection() as conn:
+            init_vote_tables(conn.cursor())
+
+    if not migrated:
+        with pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT article_id, user_fingerprint, option_text, voted_at
+                FROM user_votes
+            """).fetchall()
+
+        by_shard = [[] for _ in shards]
+
+        for row in rows:
+            by_shard[shard_index(row["user_fingerprint"], count)].append(tuple(row))
+
+        # Copies are idempotent, so processes starting together can all run this.
+        for shard, shard_rows in zip(shards, by_shard):
+            with shard.connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("""
+                    INSERT OR IGNORE INTO user_votes (article_id, user_fingerprint, option_text, voted_at)
+                    VALUES (?, ?, ?, ?)
+                """, shard_rows)
+                conn.commit()
+
+        with pool.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM user_votes")
+            conn.execute("INSERT OR IGNORE INTO vote_meta (key, value) VALUES ('user_votes_sharded', '1')")
+            conn.commit()
+
+    return shards
+
+
+@st.cache_resource(show_spinner=False)
+def get_vote_shards():
+    return open_vote_shards(get_db_pool())
+
+
+def get_user_shard(user_fingerprint):
+    shards = get_vote_shards()
+    return shards[shard_index(user_fingerprint, len(shards))]
 
 
 # ─────────────────────────────────────────────────────────────────
@@ -119,54 +360,323 @@ def extract_image_from_entry(entry):
     return None
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def scrape_article_image(url: str) -> str | None:
-    """Last resort: scrape the article page for og:image. Cached for 5 minutes."""
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "en-US,en;q=0.9",
-        }
-        r = requests.get(url, headers=headers, timeout=5)
-        soup = BeautifulSoup(r.content, "lxml")
+DEFAULT_PALETTE = ((30, 30, 60), (79, 70, 229), (129, 140, 248))
+PALETTE_SAMPLE_SIZE = (64, 64)
+
 
-        og = soup.find("meta", property="og:image")
-        if og and og.get("content"):
-            return og["content"]
+def get_dominant_colors(img, num_colors=3):
+    """Palette of an already decoded image, sampled from a tiny in-memory copy."""
+    try:
+        sample = img.convert("RGB")
+        sample.thumbnail(PALETTE_SAMPLE_SIZE)
 
-        img = soup.find("img", src=True)
-        return img["src"] if img else None
+        buf = BytesIO()
+        sample.save(buf, "PNG")
+        buf.seek(0)
 
+        palette = ColorThief(buf).get_palette(color_count=num_colors, quality=1)
+        return tuple(clamp_rgb(c) for c in palette[:num_colors])
     except Exception:
-        return None
+        return DEFAULT_PALETTE
 
 
-def get_dominant_colors(image_url, num_colors=3):
-    try:
-        r = requests.get(image_url, timeout=5)
-        img = Image.open(BytesIO(r.content)).convert("RGB")
-        img.save("temp_image.jpg")
-        ct = ColorThief("temp_image.jpg")
-        return ct.get_palette(color_count=num_colors)
-    except Exception:
-        return [(30, 30, 60), (79, 70, 229), (129, 140, 248)]
+def clamp_rgb(rgb):
+    # ColorThief's quantizer can round a channel up to 256.
+    return tuple(min(max(int(c), 0), 255) for c in rgb)
 
 
 def rgb_to_hex(rgb):
-    return "#%02x%02x%02x" % rgb
+    return "#%02x%02x%02x" % clamp_rgb(rgb)
 
 
 def create_css_gradient(colors):
     return f"linear-gradient(135deg, {', '.join(rgb_to_hex(c) for c in colors)})"
 
 
+# Card thumbnails are served by Streamlit's static file server from
+# ./static next to this script (server.enableStaticServing). They are JPEG
+# because Pillow can always encode it, while WebP needs an optional codec.
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THUMB_DIR = os.path.join(STATIC_DIR, "thumbs")
+THUMB_URL_PREFIX = "app/static/thumbs"
+THUMB_SIZE = (640, 360)
+THUMB_QUALITY = 78
+THUMB_FETCH_TIMEOUT = 8
+THUMB_MAX_SOURCE_BYTES = 15 * 1024 * 1024
+THUMB_CACHE_MAX_BYTES = 256 * 1024 * 1024
+THUMB_MISS_TTL = 600
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    digest: str
+    size: int
+    palette: tuple = DEFAULT_PALETTE
+
+
+def make_thumbnail(data, size=THUMB_SIZE):
+    """
+    Downscale a source image once. Returns (progressive JPEG bytes, palette);
+    the palette is taken from the downscaled copy, not the full-size original.
+    """
+    img = Image.open(BytesIO(data))
+    # For JPEG sources, decode at a reduced scale instead of full resolution.
+    img.draft("RGB", (size[0] * 2, size[1] * 2))
+    img = img.convert("RGB")
+    img.thumbnail(size, Image.LANCZOS)
+
+    out = BytesIO()
+    img.save(out, "JPEG", quality=THUMB_QUALITY, optimize=True, progressive=True)
+    return out.getvalue(), get_dominant_colors(img)
+
+
+def write_thumbnail(data):
+    """Store a thumbnail under its content hash. Returns a Thumbnail."""
+    thumb, palette = make_thumbnail(data)
+    digest = hashlib.sha256(thumb).hexdigest()
+    path = os.path.join(THUMB_DIR, f"{digest}.jpg")
+
+    if not os.path.exists(path):
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+
+        with open(tmp, "wb") as f:
+            f.write(thumb)
+
+        os.replace(tmp, path)
+
+    return Thumbnail(digest, len(thumb), palette)
+
+
+async def fetch_thumbnail_async(session, image_url):
+    """Download a source image once and store its thumbnail; None on failure."""
+    try:
+        timeout = aiohttp.ClientTimeout(total=THUMB_FETCH_TIMEOUT)
+
+        async with session.get(image_url, timeout=timeout) as resp:
+            if resp.status >= 400 or (resp.content_length or 0) > THUMB_MAX_SOURCE_BYTES:
+                return None
+
+            # Content-Length may be missing or wrong, so the cap is enforced
+            # on the bytes actually read.
+            data = bytearray()
+
+            while len(data) <= THUMB_MAX_SOURCE_BYTES:
+                chunk = await resp.content.read(THUMB_MAX_SOURCE_BYTES + 1 - len(data))
+
+                if not chunk:
+                    break
+
+                data += chunk
+
+            if len(data) > THUMB_MAX_SOURCE_BYTES:
+                return None
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, write_thumbnail, data)
+
+    except Exception:
+        return None
+
+
+class ThumbnailCache:
+    """
+    Index of source image URL -> thumbnail file, kept in the content database.
+
+    Files are content-addressed, so the same picture behind several URLs is
+    stored once; each row also keeps the image's palette for the card
+    gradient. Failed sources are remembered for ``miss_ttl`` seconds.
+    Once the indexed total passes ``max_bytes``, the least recently shown
+    entries are dropped and any file no longer referenced is deleted.
+    """
+
+    def __init__(self, pool, max_bytes=THUMB_CACHE_MAX_BYTES, miss_ttl=THUMB_MISS_TTL):
+        self.pool = pool
+        self.max_bytes = max_bytes
+        self.miss_ttl = miss_ttl
+
+    def get_many(self, image_urls):
+        """Return {image_url: Thumbnail, or None for a recent failure}."""
+        keys = {hashlib.sha1(u.encode()).hexdigest(): u for u in image_urls}
+
+        if not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        touched = []
+
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT source_key, digest, size, palette, created_at, accessed_at
+                FROM thumbnails
+                WHERE source_key IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(keys)),)).fetchall()
+
+            for row in rows:
+                if row["digest"] is None and now - row["created_at"] > self.miss_ttl:
+                    continue
+
+                if row["digest"] and not os.path.exists(os.path.join(THUMB_DIR, f"{row['digest']}.jpg")):
+                    continue
+
+                found[keys[row["source_key"]]] = row["digest"] and Thumbnail(
+                    row["digest"],
+                    row["size"],
+                    tuple(tuple(c) for c in json.loads(row["palette"] or "null") or DEFAULT_PALETTE),
+                )
+
+                if now - row["accessed_at"] > 60:
+                    touched.append(row["source_key"])
+
+            if touched:
+                conn.execute("""
+                    UPDATE thumbnails SET accessed_at = ?
+                    WHERE source_key IN (SELECT value FROM json_each(?))
+                """, (now, json.dumps(touched)))
+
+        return found
+
+    def put_many(self, results):
+        """Record {image_url: Thumbnail or None}."""
+        if not results:
+            return
+
+        now = time.time()
+        rows = [
+            (
+                hashlib.sha1(url.encode()).hexdigest(),
+                url,
+                thumb.digest if thumb else None,
+                thumb.size if thumb else 0,
+                json.dumps(thumb.palette) if thumb else None,
+                now,
+                now,
+            )
+            for url, thumb in results.items()
+        ]
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+
+            cur.executemany("""
+                INSERT OR REPLACE INTO thumbnails (
+                    source_key, source_url, digest, size, palette, created_at, accessed_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            evicted = cur.execute("""
+                SELECT source_key, digest FROM (
+                    SELECT source_key, digest, SUM(size) OVER (ORDER BY accessed_at DESC) AS running
+                    FROM thumbnails
+                )
+                WHERE running > ?
+            """, (self.max_bytes,)).fetchall()
+
+            cur.executemany(
+                "DELETE FROM thumbnails WHERE source_key = ?",
+                [(row["source_key"],) for row in evicted],
+            )
+
+            orphans = [
+                row["digest"] for row in evicted
+                if row["digest"] and not cur.execute(
+                    "SELECT 1 FROM thumbnails WHERE digest = ? LIMIT 1", (row["digest"],)
+                ).fetchone()
+            ]
+
+            conn.commit()
+
+        for digest in orphans:
+            try:
+                os.remove(os.path.join(THUMB_DIR, f"{digest}.jpg"))
+            except OSError:
+                pass
+
+
+@st.cache_resource(show_spinner=False)
+def get_thumbnail_cache():
+    return ThumbnailCache(get_content_pool())
+
+
+def thumbnails_enabled():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def start_thumbnail_fetches(image_urls):
+    """
+    Split ``image_urls`` into known thumbnails and fetches started on the shared loop.
+
+    Returns ({image_url: Thumbnail or None}, {image_url: Future}). Finished
+    fetches record themselves in the thumbnail cache, and an image already
+    being fetched, by this run or an earlier one, is not fetched again.
+    Resizing and palette extraction share one download and run together in
+    the loop's thread pool.
+    """
+    if not image_urls:
+        return {}, {}
+
+    cache = get_thumbnail_cache()
+    thumbs = cache.get_many(image_urls)
+    missing = [u for u in dict.fromkeys(image_urls) if u not in thumbs]
+    futures = {}
+
+    if missing:
+        fetcher = get_http_fetcher()
+        futures = {
+            u: fetcher.fetch_once("thumb", u, fetch_thumbnail_async(fetcher.session, u), cache.put_many)
+            for u in missing
+        }
+
+    return thumbs, futures
+
+
+def thumbnail_src(image_url, thumb):
+    """
+    Where a card should load its picture from: the thumbnail, else the original.
+    With static serving off there is nowhere to serve thumbnails from.
+    """
+    if thumb and thumbnails_enabled():
+        return f"{THUMB_URL_PREFIX}/{thumb.digest}.jpg"
+
+    return image_url
+
+
+def thumbnail_palette(thumb):
+    return thumb.palette if thumb else DEFAULT_PALETTE
+
+
 # ─────────────────────────────────────────────────────────────────
 # Anonymous identity helpers: Firebase-free
 # ─────────────────────────────────────────────────────────────────
+def get_request_headers():
+    """
+    Headers of the request that opened this session, or {} outside one.
+
+    st.context only exists from Streamlit 1.37; older releases expose the
+    same headers through an internal helper.
+    """
+    context = getattr(st, "context", None)
+
+    if context is not None:
+        return context.headers or {}
+
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+    except ImportError:
+        return {}
+
+    return _get_websocket_headers() or {}
+
+
+# Reverse proxies in front of the app. Each appends the address it saw to
+# X-Forwarded-For, so only the last this-many entries were not written by
+# the client itself.
+TRUSTED_PROXY_HOPS = int(os.environ.get("EKO_TRUSTED_PROXY_HOPS", "1"))
+
+
 def get_client_ip():
     """
     Best-effort client IP capture.
@@ -174,14 +684,17 @@ def get_client_ip():
     Notes:
     - On local machine, this may return 'unknown_ip'.
     - On hosted apps, IP may come through reverse proxy headers.
+    - X-Forwarded-For is read from the right: the leftmost entries are
+      whatever the client sent, and the vote limiter is keyed on this.
     - IP alone is not a perfect identity, so this app combines it with a browser cookie.
     """
     try:
-        headers = st.context.headers
+        headers = get_request_headers()
 
         forwarded_for = headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+        if forwarded_for and TRUSTED_PROXY_HOPS > 0:
+            hops = [hop.strip() for hop in forwarded_for.split(",")]
+            return hops[-min(TRUSTED_PROXY_HOPS, len(hops))]
 
         real_ip = headers.get("X-Real-IP")
         if real_ip:
@@ -234,298 +747,2152 @@ def get_user_fingerprint():
     return hashlib.sha256(raw.encode()).hexdigest()
 
 
-def check_login():
-    if "user" not in st.session_state:
-        return False
+def check_login():
+    if "user" not in st.session_state:
+        return False
+
+    if "voted_articles" not in st.session_state:
+        raw = controller.get("voted_articles") or "[]"
+
+        if not isinstance(raw, str):
+            raw = json.dumps(raw)
+
+        try:
+            st.session_state["voted_articles"] = json.loads(raw)
+        except json.JSONDecodeError:
+            st.session_state["voted_articles"] = []
+
+    return True
+
+
+def register_anonymous():
+    """
+    Anonymous registration without Firebase.
+    Uses browser cookies and best-effort IP capture.
+    """
+    st.markdown("<h2 style='text-align:center;'>Register anonymously</h2>", unsafe_allow_html=True)
+    st.write("No email needed — your identity stays protected.")
+    st.caption("Your IP address may be used only to maintain anonymous voting integrity.")
+
+    if st.button("Continue anonymously", key="anon_reg_btn"):
+        anon_id = controller.get("anonymous_id")
+
+        if not anon_id:
+            client_ip = get_client_ip()
+            raw_id = f"{client_ip}_{time.time()}_{random.randint(1000, 9999)}"
+            anon_id = hashlib.sha256(raw_id.encode()).hexdigest()
+
+            controller.set("anonymous_id", anon_id)
+            controller.set("user_ip", client_ip)
+
+        random_name = controller.get("anonymous_name")
+
+        if not random_name:
+            random_name = f"User{random.randint(1000, 9999)}"
+            controller.set("anonymous_name", random_name)
+
+        controller.set("user", anon_id)
+
+        st.session_state.update({
+            "user": anon_id,
+            "username": random_name,
+            "voted_articles": [],
+            "page": "Main",
+        })
+
+        st.success("Registered anonymously.")
+        st.rerun()
+
+
+def logout():
+    if st.sidebar.button("Logout", key="logout_btn"):
+        for k in ["user", "voted_articles", "username"]:
+            st.session_state.pop(k, None)
+
+        controller.remove("user")
+        st.rerun()
+
+
+# ─────────────────────────────────────────────────────────────────
+# Voting database functions
+# ─────────────────────────────────────────────────────────────────
+def has_user_voted(article_id):
+    user_fingerprint = get_user_fingerprint()
+
+    with get_user_shard(user_fingerprint).connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT option_text
+            FROM user_votes
+            WHERE article_id = ?
+            AND user_fingerprint = ?
+        """, (article_id, user_fingerprint))
+
+        row = cur.fetchone()
+
+    return row["option_text"] if row else None
+
+
+TALLY_CACHE_SIZE = 4096
+TALLY_CACHE_TTL = 10
+
+
+class VoteTallyCache:
+    """
+    Process-wide LRU cache of ``{option_text: vote_count}`` per article.
+
+    A write invalidates its articles twice: just before its transaction
+    commits and again just after. Each invalidation drops the entry and takes
+    the next number from a write sequence. Readers note the sequence before
+    going to SQLite and only store what they read if no write for that
+    article started in the meantime, so a read that raced a commit can never
+    be stored and served as current. Entries also expire after ``ttl``
+    seconds to pick up votes written by other processes.
+    """
+
+    def __init__(self, max_entries=TALLY_CACHE_SIZE, ttl=TALLY_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()      # article_id -> (loaded_at, results)
+        self._last_write = OrderedDict()   # article_id -> write sequence
+        self._write_seq = 0
+        self._forgotten_seq = 0
+
+    def get_many(self, article_ids):
+        """Return ({article_id: results} for fresh hits, read token)."""
+        now = time.monotonic()
+        found = {}
+
+        with self._lock:
+            for aid in article_ids:
+                entry = self._entries.get(aid)
+
+                if entry and now - entry[0] < self.ttl:
+                    self._entries.move_to_end(aid)
+                    found[aid] = entry[1]
+                    self.hits += 1
+                else:
+                    self.misses += 1
+
+            return found, self._write_seq
+
+    def fill(self, tallies, token):
+        """Store tallies read from SQLite after ``get_many`` returned ``token``."""
+        now = time.monotonic()
+
+        with self._lock:
+            for aid, results in tallies.items():
+                if self._last_write.get(aid, self._forgotten_seq) > token:
+                    continue
+
+                self._entries[aid] = (now, results)
+                self._entries.move_to_end(aid)
+
+            self._evict()
+
+    def invalidate(self, article_ids):
+        """Drop tallies changed elsewhere, including reads already in flight."""
+        with self._lock:
+            for aid in article_ids:
+                self._write_seq += 1
+                self._last_write[aid] = self._write_seq
+                self._last_write.move_to_end(aid)
+                self._entries.pop(aid, None)
+
+            self._evict()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+        # Forgetting an article's last write is safe as long as every
+        # forgotten article is treated as written at the newest such sequence.
+        while len(self._last_write) > self.max_entries:
+            _, seq = self._last_write.popitem(last=False)
+            self._forgotten_seq = max(self._forgotten_seq, seq)
+
+
+@st.cache_resource(show_spinner=False)
+def get_tally_cache():
+    return VoteTallyCache()
+
+
+VOTE_BATCH_WINDOW = 0.005
+VOTE_BATCH_MAX = 256
+VOTE_WRITE_TIMEOUT = 30
+VOTE_CHANGE_RETENTION = 24 * 3600
+
+
+@dataclass
+class PendingVote:
+    article_id: str
+    article_url: str
+    article_title: str
+    option_text: str
+    user_fingerprint: str
+    voted_at: str
+    done: Future = field(default_factory=Future)
+
+
+class VoteWriter:
+    """
+    Write-behind queue that group-commits concurrent votes.
+
+    A single background thread drains whatever votes arrive within
+    ``window`` seconds and writes them in one transaction, so a burst costs
+    one fsync instead of one per click. Each vote runs inside its own
+    savepoint: a duplicate trips the UNIQUE constraint on ``user_votes``
+    and is rolled back alone without failing the rest of the batch.
+    Callers are only answered once the batch has committed.
+
+    There is one writer per vote shard, each with its own thread and file.
+    """
+
+    def __init__(self, pool, tally_cache, window=VOTE_BATCH_WINDOW, max_batch=VOTE_BATCH_MAX):
+        self.pool = pool
+        self.tally_cache = tally_cache
+        self.window = window
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._next_prune = 0
+        self._thread = threading.Thread(target=self._run, name="eko-vote-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, vote):
+        self._queue.put(vote)
+        return vote.done
+
+    def depth(self):
+        return self._queue.qsize()
+
+    def _connect(self):
+        conn = self.pool.connect()
+        # Durability is paid once per batch, so the writer can afford a full sync.
+        conn.execute("PRAGMA synchronous = FULL")
+        return conn
+
+    def _run(self):
+        conn = None
+
+        # This thread is the only writer for its shard, so nothing may end
+        # it: a failed batch is reported to its callers and the loop goes on.
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+
+                try:
+                    batch.append(self._queue.get(timeout=max(remaining, 0)))
+                except queue.Empty:
+                    break
+
+            try:
+                if conn is None:
+                    conn = self._connect()
+
+                self._commit(conn, batch)
+
+            except Exception as exc:
+                for vote in batch:
+                    if not vote.done.done():
+                        vote.done.set_exception(exc)
+
+                # Whatever state the failure left the connection in (even a
+                # transaction that would not roll back), the next batch starts
+                # on a fresh one. Closing also discards any open transaction.
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+
+                conn = None
+
+            if conn is not None and time.monotonic() >= self._next_prune:
+                self._next_prune = time.monotonic() + 3600
+
+                try:
+                    conn.execute("DELETE FROM vote_changes WHERE changed_at < ?", (time.time() - VOTE_CHANGE_RETENTION,))
+                except sqlite3.Error:
+                    pass
+
+    def _commit(self, conn, batch):
+        cur = conn.cursor()
+        outcomes = []
+
+        try:
+            cur.execute("BEGIN IMMEDIATE")
+
+            for vote in batch:
+                cur.execute("SAVEPOINT vote")
+
+                try:
+                    # This insert enforces one vote per user per article.
+                    cur.execute("""
+                        INSERT INTO user_votes (
+                            article_id,
+                            user_fingerprint,
+                            option_text,
+                            voted_at
+                        )
+                        VALUES (?, ?, ?, ?)
+                    """, (vote.article_id, vote.user_fingerprint, vote.option_text, vote.voted_at))
+
+                    # This upsert increments the public total count for the selected option.
+                    cur.execute("""
+                        INSERT INTO article_votes (
+                            article_id,
+                            article_url,
+                            article_title,
+                            option_text,
+                            vote_count
+                        )
+                        VALUES (?, ?, ?, ?, 1)
+                        ON CONFLICT(article_id, option_text)
+                        DO UPDATE SET vote_count = vote_count + 1
+                    """, (vote.article_id, vote.article_url, vote.article_title, vote.option_text))
+
+                    cur.execute("""
+                        INSERT INTO vote_changes (article_id, option_text, changed_at)
+                        VALUES (?, ?, ?)
+                    """, (vote.article_id, vote.option_text, time.time()))
+
+                    cur.execute("RELEASE vote")
+                    outcomes.append(True)
+
+                except sqlite3.IntegrityError:
+                    cur.execute("ROLLBACK TO vote")
+                    cur.execute("RELEASE vote")
+                    outcomes.append(False)
+
+            # Reads that start from here on may or may not see this batch, so
+            # none of them may be cached until the commit is visible.
+            written = {vote.article_id for vote, recorded in zip(batch, outcomes) if recorded}
+            self.tally_cache.invalidate(written)
+            conn.commit()
+            self.tally_cache.invalidate(written)
+
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+
+        for vote, recorded in zip(batch, outcomes):
+            vote.done.set_result(recorded)
+
+
+@st.cache_resource(show_spinner=False)
+def get_vote_writers():
+    tally_cache = get_tally_cache()
+    return [VoteWriter(shard, tally_cache) for shard in get_vote_shards()]
+
+
+VOTE_CHANGE_POLL_INTERVAL = 2
+VOTE_CHANGE_BUFFER = 10000
+
+
+class VoteChangeFeed:
+    """
+    Process-wide reader of the ``vote_changes`` logs in every shard.
+
+    A cursor is one sequence number per shard. At most every ``interval``
+    seconds one caller reads the rows past the feed's own cursor, keeps them
+    in a bounded buffer and drops those articles from the tally cache, so
+    votes from other processes show up without waiting for the cache TTL.
+    Sessions then ask what changed since their cursor from memory alone.
+    """
+
+    def __init__(self, shards, tally_cache, interval=VOTE_CHANGE_POLL_INTERVAL, buffer=VOTE_CHANGE_BUFFER):
+        self.shards = shards
+        self.tally_cache = tally_cache
+        self.interval = interval
+        self.buffer = buffer
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._changes = deque()   # (shard, seq, article_id)
+        self._cursor = []
+
+        for shard in shards:
+            with shard.connection() as conn:
+                self._cursor.append(conn.execute("SELECT COALESCE(MAX(seq), 0) FROM vote_changes").fetchone()[0])
+
+        # Changes at or below the floor are no longer in the buffer.
+        self._floor = list(self._cursor)
+        self._polled_at = time.monotonic()
+
+    def cursor(self):
+        """The feed's position as of its last read, without reading."""
+        with self._lock:
+            return tuple(self._cursor)
+
+    def changes_since(self, cursor):
+        """
+        Return (latest cursor, set of changed article ids) since ``cursor``.
+
+        The set is None when ``cursor`` is too old or from another shard
+        layout; the caller should then reload everything it shows.
+        """
+        self._refresh()
+
+        with self._lock:
+            latest = tuple(self._cursor)
+
+            if len(cursor) != len(latest) or any(c < f for c, f in zip(cursor, self._floor)):
+                return latest, None
+
+            # Each shard's entries are in seq order, so walking back from the
+            # newest end can stop once every shard has reached the cursor.
+            pending = {shard for shard, (c, l) in enumerate(zip(cursor, latest)) if c < l}
+            changed = set()
+
+            for shard, seq, aid in reversed(self._changes):
+                if not pending:
+                    break
+
+                if shard not in pending:
+                    continue
+
+                if seq > cursor[shard]:
+                    changed.add(aid)
+                else:
+                    pending.discard(shard)
+
+            return latest, changed
+
+    def _refresh(self):
+        if time.monotonic() - self._polled_at < self.interval:
+            return
+
+        # One reader at a time; everyone else answers from the current buffer.
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+
+        try:
+            self._polled_at = time.monotonic()
+            rows = []
+
+            for index, shard in enumerate(self.shards):
+                with shard.connection() as conn:
+                    rows.extend(
+                        (index, row["seq"], row["article_id"])
+                        for row in conn.execute("""
+                            SELECT seq, article_id FROM vote_changes
+                            WHERE seq > ?
+                            ORDER BY seq
+                        """, (self._cursor[index],))
+                    )
+
+            if not rows:
+                return
+
+            # Drop the stale tallies before anyone can see the new cursor, or
+            # a session could reload from the cache and move past the vote.
+            self.tally_cache.invalidate({aid for _, _, aid in rows})
+
+            with self._lock:
+                for index, seq, aid in rows:
+                    self._changes.append((index, seq, aid))
+                    self._cursor[index] = max(self._cursor[index], seq)
+
+                while len(self._changes) > self.buffer:
+                    index, seq, _ = self._changes.popleft()
+                    self._floor[index] = seq
+
+        finally:
+            self._refresh_lock.release()
+
+
+@st.cache_resource(show_spinner=False)
+def get_vote_change_feed():
+    return VoteChangeFeed(get_vote_shards(), get_tally_cache())
+
+
+def tallies_changed_since(cursor, article_ids):
+    """
+    Tallies for those of ``article_ids`` that received votes after ``cursor``.
+
+    Returns (latest cursor, {article_id: results}). Nothing is read from
+    SQLite unless one of the articles actually changed.
+    """
+    latest, changed = get_vote_change_feed().changes_since(cursor)
+    ids = article_ids if changed is None else [aid for aid in article_ids if aid in changed]
+
+    return latest, (load_vote_tallies(ids) if ids else {})
+
+
+# Admission control: each fingerprint and each IP gets a token bucket, and the
+# whole process refuses new votes while the write queues are backed up.
+VOTE_FINGERPRINT_BURST = 5
+VOTE_FINGERPRINT_RATE = 0.2      # tokens per second
+VOTE_IP_BURST = 30
+VOTE_IP_RATE = 2.0
+VOTE_LIMITER_KEYS = 100_000
+VOTE_QUEUE_HIGH_WATER = 2000
+
+
+class VoteRejected(Exception):
+    """A vote turned away before any database work; ``reason`` is "limited" or "busy"."""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class TokenBucketLimiter:
+    """
+    Thread-safe token buckets, one per key, refilled at ``rate`` per second.
+
+    ``ready`` and ``take`` are separate so a caller can check several buckets
+    before spending from any of them. Two callers racing between the two may
+    leave a bucket one token in debt, which only delays its refill.
+
+    Only the ``max_keys`` most recently used keys are remembered. A key that
+    falls out comes back with a full bucket, which is the same as one idle
+    long enough to refill.
+    """
+
+    def __init__(self, rate, burst, max_keys=VOTE_LIMITER_KEYS):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()   # key -> (tokens, updated_at)
+
+    def ready(self, key):
+        """Whether ``key`` has a whole token, without spending it."""
+        return self._update(key, 0) >= 1
+
+    def take(self, key):
+        """Spend one token for ``key``."""
+        self._update(key, 1)
+
+    def _update(self, key, spend):
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+
+            self._buckets[key] = (tokens - spend, now)
+
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+            return tokens
+
+
+@st.cache_resource(show_spinner=False)
+def get_vote_limiters():
+    return (
+        TokenBucketLimiter(VOTE_FINGERPRINT_RATE, VOTE_FINGERPRINT_BURST),
+        TokenBucketLimiter(VOTE_IP_RATE, VOTE_IP_BURST),
+    )
+
+
+def admit_vote(user_fingerprint, client_ip):
+    """Raise VoteRejected unless this vote may be queued. Touches no database."""
+    if sum(writer.depth() for writer in get_vote_writers()) >= VOTE_QUEUE_HIGH_WATER:
+        raise VoteRejected("busy")
+
+    by_fingerprint, by_ip = get_vote_limiters()
+
+    # Rotating cookies mints new fingerprints, so the IP bucket is what holds
+    # a scripted client back. An unknown IP is not one client, so pooling
+    # those would let one of them starve the rest; they get the fingerprint
+    # limit only.
+    buckets = [(by_fingerprint, user_fingerprint)]
+
+    if client_ip != "unknown_ip":
+        buckets.append((by_ip, client_ip))
+
+    # A vote one bucket refuses must not spend from the other.
+    if not all(limiter.ready(key) for limiter, key in buckets):
+        raise VoteRejected("limited")
+
+    for limiter, key in buckets:
+        limiter.take(key)
+
+
+def record_vote(article_id, article_url, article_title, option_text):
+    """
+    Records one vote if the user has not already voted on the article.
+
+    The write is queued on the user's shard and group-committed with any
+    concurrent votes there; this call blocks until its batch is durable.
+
+    Returns True if vote was recorded.
+    Returns False if user already voted.
+    Raises VoteRejected when rate limits or write backpressure turn it away.
+    """
+    user_fingerprint = get_user_fingerprint()
+    admit_vote(user_fingerprint, get_client_ip())
+
+    vote = PendingVote(
+        article_id=article_id,
+        article_url=article_url,
+        article_title=article_title,
+        option_text=option_text,
+        user_fingerprint=user_fingerprint,
+        voted_at=datetime.now().isoformat(),
+    )
+
+    writers = get_vote_writers()
+    writer = writers[shard_index(vote.user_fingerprint, len(writers))]
+
+    return writer.submit(vote).result(timeout=VOTE_WRITE_TIMEOUT)
+
+
+def load_vote_tallies(article_ids):
+    """
+    Return {article_id: {option_text: vote_count}} for every id.
+
+    Served from the shared tally cache. Misses are summed over the main
+    database and every vote shard, one query each. The returned dicts are
+    shared and must not be mutated.
+    """
+    article_ids = list(dict.fromkeys(article_ids))
+    cache = get_tally_cache()
+    tallies, token = cache.get_many(article_ids)
+    missing = [aid for aid in article_ids if aid not in tallies]
+
+    if not missing:
+        return tallies
+
+    counts = {aid: Counter() for aid in missing}
+
+    for pool in [get_db_pool(), *get_vote_shards()]:
+        with pool.connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT article_id, option_text, vote_count
+                FROM article_votes
+                WHERE article_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(missing),))
+
+            for row in cur.fetchall():
+                counts[row["article_id"]][row["option_text"]] += row["vote_count"]
+
+    loaded = {aid: dict(c.most_common()) for aid, c in counts.items()}
+    cache.fill(loaded, token)
+    tallies.update(loaded)
+    return tallies
+
+
+def get_vote_results(article_id, options=None):
+    results = dict(load_vote_tallies([article_id])[article_id])
+
+    if options:
+        for opt in options:
+            results.setdefault(opt, 0)
+
+    return results
+
+
+@dataclass
+class PollState:
+    """What one card's poll needs: the session's prior vote and the tally."""
+    voted_option: str | None = None
+    results: dict = field(default_factory=dict)
+    seen: tuple = ()   # vote change cursor the results are current as of
+
+
+def make_article_id(article_url):
+    return hashlib.md5(article_url.encode()).hexdigest()
+
+
+def load_poll_states(article_ids, user_fingerprint):
+    """
+    Bulk-load poll state for every article on the page.
+
+    The session's prior votes come from one query against ``user_votes`` in
+    the user's shard;
+    tallies come from ``load_vote_tallies``, which only touches SQLite for
+    articles missing from the shared cache. The ids are bound as a single
+    JSON array so the SQL text never changes and stays in the statement cache.
+
+    Returns {article_id: PollState}.
+    """
+    article_ids = list(dict.fromkeys(article_ids))
+
+    if not article_ids:
+        return {}
+
+    # Taken before the tallies, so a vote landing in between is reported again
+    seen = get_vote_change_feed().cursor()
+    tallies = load_vote_tallies(article_ids)
+    states = {aid: PollState(results=tallies[aid], seen=seen) for aid in article_ids}
+
+    with get_user_shard(user_fingerprint).connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT article_id, option_text
+            FROM user_votes
+            WHERE article_id IN (SELECT value FROM json_each(?))
+            AND user_fingerprint = ?
+        """, (json.dumps(article_ids), user_fingerprint))
+
+        for row in cur.fetchall():
+            states[row["article_id"]].voted_option = row["option_text"]
+
+    return states
+
+
+# ─────────────────────────────────────────────────────────────────
+# Feed helpers
+# ─────────────────────────────────────────────────────────────────
+NEWS_SOURCES = {
+    "Sky News": "https://feeds.skynews.com/feeds/rss/home.xml",
+    "BBC": "http://feeds.bbci.co.uk/news/rss.xml",
+    "RTE": "https://www.rte.ie/rss/news.xml",
+    "Al Jazeera": "http://www.aljazeera.com/xml/rss/all.xml",
+    "ESPN": "https://www.espn.com/espn/rss/news",
+    "Business Insider": "https://www.businessinsider.com/rss",
+    "The Guardian": "https://www.theguardian.com/world/rss",
+}
+
+CONTENT_DB_PATH = "eko_content.db"
+FEED_POLL_INTERVAL = 300
+FEED_FETCH_TIMEOUT = 8
+FEED_FETCH_WORKERS = 8
+FEED_RETENTION_DAYS = 30
+ARTICLE_CACHE_TTL = 24 * 3600
+ARTICLE_CACHE_MISS_TTL = 600
+ARTICLE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ARTICLE_CACHE_VERSION = "2"
+SEARCH_BODY_MAX_CHARS = 20000
+SEARCH_RESULT_LIMIT = 200
+
+
+def init_content_db(pool):
+    with pool.connection() as conn:
+        cur = conn.cursor()
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS feed_state (
+                feed_url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                last_polled REAL NOT NULL,
+                last_status INTEGER
+            )
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS feed_entries (
+                entry_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                link TEXT NOT NULL,
+                title TEXT NOT NULL,
+                summary TEXT NOT NULL DEFAULT '',
+                published_ts REAL,
+                image_url TEXT,
+                feed_rank INTEGER NOT NULL DEFAULT 0,
+                ingested_at REAL NOT NULL
+            )
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_feed_entries_source
+            ON feed_entries (source, published_ts)
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_feed_entries_link
+            ON feed_entries (link)
+        """)
+
+        init_search_index(cur)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS article_cache (
+                url_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_article_cache_accessed
+            ON article_cache (accessed_at)
+        """)
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS thumbnails (
+                source_key TEXT PRIMARY KEY,
+                source_url TEXT NOT NULL,
+                digest TEXT,
+                size INTEGER NOT NULL,
+                palette TEXT,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_thumbnails_digest
+            ON thumbnails (digest)
+        """)
+
+        ensure_column(cur, "thumbnails", "palette", "TEXT")
+
+        # v1: summaries are stored as plain text, stripped of feed HTML at ingest
+        if cur.execute("PRAGMA user_version").fetchone()[0] < 1:
+            cur.execute("BEGIN IMMEDIATE")
+            rows = cur.execute("SELECT entry_id, summary FROM feed_entries").fetchall()
+
+            cur.executemany(
+                "UPDATE feed_entries SET summary = ? WHERE entry_id = ?",
+                [(summary_text(row["summary"]), row["entry_id"]) for row in rows],
+            )
+            cur.execute("PRAGMA user_version = 1")
+            conn.commit()
+
+
+def init_search_index(cur):
+    """
+    Full-text index over every stored entry, rowid-aligned with ``feed_entries``.
+
+    Titles and summaries follow the feed table through triggers, so ingest
+    updates the index in the same transaction. Article bodies are added by
+    ``ArticleCache.put_many`` as pages are fetched.
+    """
+    exists = cur.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'entry_search'"
+    ).fetchone()
+
+    cur.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS entry_search USING fts5(
+            title, summary, body,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS feed_entries_search_insert
+        AFTER INSERT ON feed_entries BEGIN
+            INSERT INTO entry_search (rowid, title, summary, body)
+            VALUES (new.rowid, new.title, new.summary, '');
+        END
+    """)
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS feed_entries_search_update
+        AFTER UPDATE OF title, summary ON feed_entries
+        WHEN old.title IS NOT new.title OR old.summary IS NOT new.summary BEGIN
+            UPDATE entry_search SET title = new.title, summary = new.summary
+            WHERE rowid = new.rowid;
+        END
+    """)
+
+    cur.execute("""
+        CREATE TRIGGER IF NOT EXISTS feed_entries_search_delete
+        AFTER DELETE ON feed_entries BEGIN
+            DELETE FROM entry_search WHERE rowid = old.rowid;
+        END
+    """)
+
+    # Stores from before the index existed are indexed once, titles and summaries only
+    if not exists:
+        cur.execute("""
+            INSERT INTO entry_search (rowid, title, summary, body)
+            SELECT rowid, title, summary, '' FROM feed_entries
+        """)
+
+
+@st.cache_resource(show_spinner=False)
+def get_content_pool():
+    """Feed and article content lives apart from votes so ingestion never holds the vote write lock."""
+    pool = ConnectionPool(CONTENT_DB_PATH)
+    init_content_db(pool)
+    return pool
+
+
+def fetch_feed(url: str, etag=None, last_modified=None):
+    """
+    Conditionally fetch a single RSS feed with a browser User-Agent to avoid 403s.
+
+    Returns (items, response). ``items`` is None when the server answered
+    304 Not Modified; otherwise it is the list from ``parse_feed``.
+    """
+    headers = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/120.0.0.0 Safari/537.36"
+        ),
+    }
+
+    if etag:
+        headers["If-None-Match"] = etag
+
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    r = requests.get(url, headers=headers, timeout=FEED_FETCH_TIMEOUT)
+
+    if r.status_code == 304:
+        return None, r
+
+    r.raise_for_status()
+    return parse_feed(r.content), r
+
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+MEDIA = "{http://search.yahoo.com/mrss/}"
+CONTENT_ENCODED = "{http://purl.org/rss/1.0/modules/content/}encoded"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+IMG_SRC = re.compile(r"""<img\b[^>]*?\ssrc\s*=\s*["']([^"']+)""", re.I)
+
+
+def rss_timestamp(value):
+    parsed = parsedate_tz(value) if value else None
+    return float(mktime_tz(parsed)) if parsed else None
+
+
+def atom_timestamp(value):
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp() if value else None
+    except ValueError:
+        return None
+
+
+def element_text(el):
+    """Text of a feed element; xhtml content keeps its markup for summary_text."""
+    if el is None:
+        return ""
+
+    if len(el):
+        return (el.text or "") + "".join(etree.tostring(child, encoding="unicode") for child in el)
+
+    return el.text or ""
+
+
+def item_image(item, *html_fields):
+    """The first image among the media:*, enclosure and inline <img> fields of an item."""
+    for thumb in item.iter(f"{MEDIA}thumbnail"):
+        if thumb.get("url"):
+            return thumb.get("url")
+
+    for m in item.iter(f"{MEDIA}content"):
+        url = m.get("url", "")
+        kind = m.get("type", "") or m.get("medium", "")
+
+        if url and ("image" in kind or url.endswith(IMAGE_EXTENSIONS)):
+            return url
+
+    for enc in item.iter("enclosure", f"{ATOM}link"):
+        if enc.tag == f"{ATOM}link" and enc.get("rel") != "enclosure":
+            continue
+
+        if "image" in enc.get("type", ""):
+            return enc.get("url") or enc.get("href")
+
+    for value in html_fields:
+        match = IMG_SRC.search(value) if "<img" in value else None
+
+        if match:
+            return html.unescape(match.group(1))
+
+    return None
+
+
+def rss_item(item):
+    summary = item.findtext("description") or ""
+
+    return {
+        "link": (item.findtext("link") or "").strip(),
+        "title": (item.findtext("title") or "").strip(),
+        "summary": summary,
+        "published_ts": rss_timestamp(item.findtext("pubDate")),
+        "image_url": item_image(item, summary, item.findtext(CONTENT_ENCODED) or ""),
+    }
+
+
+def atom_item(item):
+    link = ""
+
+    for el in item.iter(f"{ATOM}link"):
+        if el.get("rel", "alternate") == "alternate" and el.get("href"):
+            link = el.get("href")
+            break
+
+    summary = element_text(item.find(f"{ATOM}summary"))
+    content = element_text(item.find(f"{ATOM}content"))
+    published = item.findtext(f"{ATOM}published") or item.findtext(f"{ATOM}updated")
+
+    return {
+        "link": link.strip(),
+        "title": summary_text(element_text(item.find(f"{ATOM}title"))),
+        "summary": summary or content,
+        "published_ts": atom_timestamp(published),
+        "image_url": item_image(item, summary, content),
+    }
+
+
+def parse_feed_fast(content):
+    """
+    Stream RSS 2.0 or Atom bytes with lxml, keeping only the fields the app uses.
+
+    Each item is released as soon as it has been read. Returns None for any
+    other kind of feed so the caller can fall back to feedparser; malformed
+    XML raises.
+    """
+    events = etree.iterparse(
+        BytesIO(content),
+        events=("start", "end"),
+        resolve_entities=False,
+        no_network=True,
+    )
+    items = []
+    reader = None
+
+    for event, el in events:
+        if reader is None:
+            if el.tag == "rss":
+                reader, item_tag = rss_item, "item"
+            elif el.tag == f"{ATOM}feed":
+                reader, item_tag = atom_item, f"{ATOM}entry"
+            else:
+                return None
+
+        if event == "end" and el.tag == item_tag:
+            items.append(reader(el))
+            el.clear()
+
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+
+    return items
+
+
+def parse_feed(content):
+    """
+    Feed bytes to a list of {link, title, summary, published_ts, image_url}.
+
+    RSS 2.0 and Atom take the lxml fast path; anything else, or XML that
+    lxml rejects, goes through feedparser.
+    """
+    try:
+        items = parse_feed_fast(content)
+    except etree.XMLSyntaxError:
+        items = None
+
+    if items is not None:
+        return items
+
+    items = []
+
+    for entry in feedparser.parse(content).entries:
+        published = entry.get("published_parsed") or entry.get("updated_parsed")
+
+        items.append({
+            "link": entry.get("link", ""),
+            "title": entry.get("title", ""),
+            "summary": entry.get("summary", "") or entry.get("description", ""),
+            "published_ts": calendar.timegm(published) if published else None,
+            "image_url": extract_image_from_entry(entry),
+        })
+
+    return items
+
+
+def summary_text(summary):
+    """Feed summary HTML reduced to plain text, once, when it is stored."""
+    if "<" not in summary and "&" not in summary:
+        return summary.strip()
+
+    return BeautifulSoup(summary, "html.parser").get_text(" ", strip=True)
+
+
+def normalize_entry(item, source, rank):
+    """Turn a parsed feed item into a ``feed_entries`` row."""
+    return {
+        "entry_id": make_article_id(item["link"]),
+        "source": source,
+        "link": item["link"],
+        "title": item["title"],
+        "summary": summary_text(item["summary"]),
+        "published_ts": item["published_ts"],
+        "image_url": item["image_url"],
+        "feed_rank": rank,
+    }
+
+
+@dataclass(frozen=True, slots=True)
+class FeedEntry:
+    """One stored feed entry, immutable so a single copy serves every session."""
+
+    entry_id: str
+    source: str
+    link: str
+    title: str
+    summary: str
+    published_ts: float | None
+    image_url: str | None
+
+
+class EntryStore:
+    """
+    Process-wide snapshot of ``feed_entries``: one ordered tuple per source.
+
+    The ingestor swaps in a fresh tuple when a source changes, and renders
+    filter those tuples in memory. Sessions share the same entry objects
+    instead of reading and copying their own rows on every rerun.
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._lock = threading.Lock()
+        self._snapshots = {}
+
+    def refresh(self, sources):
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT entry_id, source, link, title, summary, published_ts, image_url
+                FROM feed_entries
+                WHERE source IN (SELECT value FROM json_each(?))
+                ORDER BY published_ts IS NULL, published_ts DESC, feed_rank
+            """, (json.dumps(list(sources)),)).fetchall()
+
+        snapshots = {src: [] for src in sources}
+
+        for row in rows:
+            snapshots[row["source"]].append(FeedEntry(**row))
+
+        with self._lock:
+            self._snapshots.update((src, tuple(entries)) for src, entries in snapshots.items())
+
+    def snapshot(self, source):
+        with self._lock:
+            entries = self._snapshots.get(source)
+
+        if entries is None:
+            self.refresh([source])
+
+            with self._lock:
+                entries = self._snapshots[source]
+
+        return entries
+
+    def sources(self):
+        with self._lock:
+            return list(self._snapshots)
+
+
+@st.cache_resource(show_spinner=False)
+def get_entry_store():
+    return EntryStore(get_content_pool())
+
+
+class FeedIngestor:
+    """
+    Background poller that keeps ``feed_entries`` up to date.
+
+    Every feed in ``sources`` is polled on its own ``interval`` with
+    ETag/If-Modified-Since, so an unchanged feed costs a 304. Poll times are
+    stored in ``feed_state`` and survive restarts. The render path only ever
+    reads what has already been ingested.
+
+    Due feeds are fetched concurrently on a bounded worker pool, so a sweep
+    takes as long as the slowest feed rather than the sum of all of them.
+    """
+
+    def __init__(self, pool, sources, interval=FEED_POLL_INTERVAL, entry_store=None, card_views=None):
+        self.pool = pool
+        self.sources = dict(sources)
+        self.interval = interval
+        self.entry_store = entry_store
+        self.card_views = card_views
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._next_poll = {}
+        self._polled = set()
+        self._inflight = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=FEED_FETCH_WORKERS,
+            thread_name_prefix="eko-feed",
+        )
+
+        with self.pool.connection() as conn:
+            for row in conn.execute("SELECT feed_url, last_polled FROM feed_state"):
+                self._next_poll[row["feed_url"]] = row["last_polled"] + interval
+                self._polled.add(row["feed_url"])
+
+        self._thread = threading.Thread(target=self._run, name="eko-feed-ingestor", daemon=True)
+        self._thread.start()
+
+    def polled_sources(self):
+        """Names of the sources that have completed at least one poll attempt."""
+        return {src for src, url in self.sources.items() if url in self._polled}
+
+    def poll_many(self, sources, timeout=None):
+        """
+        Poll ``sources`` concurrently and wait up to ``timeout`` seconds.
+
+        A feed that is already being fetched is not fetched twice; the caller
+        just waits on the poll in flight. Slow feeds keep running in the
+        background after the timeout and land on a later render.
+        """
+        futures = []
+
+        with self._lock:
+            for source in sources:
+                url = self.sources[source]
+                future = self._inflight.get(url)
+
+                if future is None or future.done():
+                    future = self._executor.submit(self.poll, source)
+                    self._inflight[url] = future
+
+                futures.append(future)
+
+        wait(futures, timeout=timeout)
+
+    def _run(self):
+        while True:
+            now = time.time()
+
+            due = [
+                source for source, url in self.sources.items()
+                if self._next_poll.get(url, 0) <= now
+            ]
+
+            # A failed sweep (a locked database, say) is retried on the next
+            # wake-up; it must not end the only ingest thread.
+            try:
+                self.poll_many(due)
+                self._prune()
+            except Exception:
+                pass
+
+            delay = min(self._next_poll.values(), default=now + self.interval) - time.time()
+            self._wake.wait(timeout=max(delay, 1))
+            self._wake.clear()
+
+    def poll(self, source):
+        url = self.sources[source]
+        self._next_poll[url] = time.time() + self.interval
+
+        with self.pool.connection() as conn:
+            state = conn.execute(
+                "SELECT etag, last_modified FROM feed_state WHERE feed_url = ?", (url,)
+            ).fetchone()
+
+        try:
+            items, resp = fetch_feed(
+                url,
+                etag=state["etag"] if state else None,
+                last_modified=state["last_modified"] if state else None,
+            )
+        except Exception:
+            # Keep what we have; the next interval retries. Count the attempt
+            # so a feed that is down does not hold up every page load.
+            self._polled.add(url)
+            return
+
+        entries = []
+
+        if items is not None:
+            entries = [
+                normalize_entry(item, source, rank)
+                for rank, item in enumerate(items)
+                if item["link"]
+            ]
+
+        now = time.time()
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+
+            cur.executemany("""
+                INSERT INTO feed_entries (
+                    entry_id, source, link, title, summary,
+                    published_ts, image_url, feed_rank, ingested_at
+                )
+                VALUES (
+                    :entry_id, :source, :link, :title, :summary,
+                    :published_ts, :image_url, :feed_rank, :ingested_at
+                )
+                ON CONFLICT(entry_id) DO UPDATE SET
+                    title = excluded.title,
+                    summary = excluded.summary,
+                    published_ts = COALESCE(excluded.published_ts, published_ts),
+                    image_url = COALESCE(excluded.image_url, image_url),
+                    feed_rank = excluded.feed_rank,
+                    ingested_at = excluded.ingested_at
+            """, [dict(e, ingested_at=now) for e in entries])
+
+            cur.execute("""
+                INSERT INTO feed_state (feed_url, etag, last_modified, last_polled, last_status)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(feed_url) DO UPDATE SET
+                    etag = COALESCE(excluded.etag, etag),
+                    last_modified = COALESCE(excluded.last_modified, last_modified),
+                    last_polled = excluded.last_polled,
+                    last_status = excluded.last_status
+            """, (
+                url,
+                resp.headers.get("ETag"),
+                resp.headers.get("Last-Modified"),
+                now,
+                resp.status_code,
+            ))
+
+            conn.commit()
+
+        if entries and self.entry_store is not None:
+            self.entry_store.refresh([source])
+
+            # Card markup for new and changed entries is prepared here, off the render path
+            if self.card_views is not None:
+                fresh = {e["entry_id"] for e in entries}
+
+                for e in self.entry_store.snapshot(source):
+                    if e.entry_id in fresh:
+                        self.card_views.put(e.entry_id, CardView.from_entry(e))
+
+        self._polled.add(url)
+
+    def _prune(self):
+        # ingested_at is refreshed on every poll that still carries the entry,
+        # so only entries that dropped out of their feed age out.
+        cutoff = time.time() - FEED_RETENTION_DAYS * 86400
+
+        with self.pool.connection() as conn:
+            pruned = conn.execute("DELETE FROM feed_entries WHERE ingested_at < ?", (cutoff,)).rowcount
+
+        if pruned and self.entry_store is not None:
+            self.entry_store.refresh(self.entry_store.sources())
+
+
+@st.cache_resource(show_spinner=False)
+def get_feed_ingestor():
+    return FeedIngestor(
+        get_content_pool(),
+        NEWS_SOURCES,
+        entry_store=get_entry_store(),
+        card_views=get_card_views(),
+    )
+
+
+def load_entries(sources, days=3):
+    """
+    Already-ingested entries for ``sources`` published in the last ``days``.
+
+    Entries without a publish date are kept, as before. Order follows the
+    source order, then each feed's own order. The entries are the shared
+    FeedEntry objects from the process-wide snapshot, not copies.
+    """
+    store = get_entry_store()
+    now = time.time()
+    since = now - days * 86400
+
+    return [
+        e for src in sources for e in store.snapshot(src)
+        if e.published_ts is None or since <= e.published_ts <= now
+    ]
+
+
+def search_query(text):
+    """FTS5 query matching every word of ``text`` as a prefix, so partly typed words still match."""
+    words = re.findall(r"\w+", text.lower())
+
+    if not words:
+        return None
+
+    return " AND ".join(f'"{w}"*' for w in words)
+
+
+def search_entries(text, sources, limit=SEARCH_RESULT_LIMIT):
+    """
+    Stored entries from ``sources`` matching ``text``, best match first.
+
+    Covers everything still retained, not just the days shown in the feed.
+    Matches in titles outrank summaries, which outrank article bodies.
+    """
+    query = search_query(text)
+
+    if query is None:
+        return []
+
+    with get_content_pool().connection() as conn:
+        rows = conn.execute("""
+            SELECT e.entry_id, e.source, e.link, e.title, e.summary, e.published_ts, e.image_url
+            FROM entry_search
+            JOIN feed_entries e ON e.rowid = entry_search.rowid
+            WHERE entry_search MATCH ?
+            AND e.source IN (SELECT value FROM json_each(?))
+            ORDER BY bm25(entry_search, 10.0, 4.0, 1.0), e.published_ts DESC
+            LIMIT ?
+        """, (query, json.dumps(list(sources)), limit)).fetchall()
+
+    return [FeedEntry(**row) for row in rows]
+
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid", "at_medium", "at_campaign", "at_custom", "cmp")
+
+
+def normalize_url(url):
+    """Canonical form of an article URL for cache keys: no fragment or tracking params."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAMS)
+    )
+
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        parts.path or "/",
+        urlencode(query),
+        "",
+    ))
+
+
+def article_cache_key(url):
+    # The version prefix retires rows written in an older payload format.
+    return hashlib.sha1(f"{ARTICLE_CACHE_VERSION}:{normalize_url(url)}".encode()).hexdigest()
+
+
+def empty_article():
+    return {"text": "", "image_url": None, "canonical_url": None, "published_time": None}
+
+
+class ArticleCache:
+    """
+    On-disk cache of parsed article pages, shared by every session.
+
+    Each page's text and metadata are keyed by normalized URL and stored as
+    zlib-compressed JSON in the content database, so they survive restarts. Entries expire after ``ttl``
+    seconds (failed fetches after ``miss_ttl``). Once the compressed total
+    passes ``max_bytes``, the least recently read entries are evicted.
+    """
+
+    def __init__(self, pool, ttl=ARTICLE_CACHE_TTL, miss_ttl=ARTICLE_CACHE_MISS_TTL,
+                 max_bytes=ARTICLE_CACHE_MAX_BYTES):
+        self.pool = pool
+        self.ttl = ttl
+        self.miss_ttl = miss_ttl
+        self.max_bytes = max_bytes
+
+    def get_many(self, urls):
+        """Return {url: article} for every url with a fresh cached page."""
+        keys = {}
+
+        for url in urls:
+            keys.setdefault(article_cache_key(url), []).append(url)
+
+        if not keys:
+            return {}
+
+        now = time.time()
+        found = {}
+        touched = []
+
+        with self.pool.connection() as conn:
+            rows = conn.execute("""
+                SELECT url_key, body, fetched_at, accessed_at
+                FROM article_cache
+                WHERE url_key IN (SELECT value FROM json_each(?))
+            """, (json.dumps(list(keys)),)).fetchall()
+
+            for row in rows:
+                article = json.loads(zlib.decompress(row["body"]))
+                ttl = self.ttl if article["text"] or article["image_url"] else self.miss_ttl
+
+                if now - row["fetched_at"] > ttl:
+                    continue
+
+                for url in keys[row["url_key"]]:
+                    found[url] = article
+
+                # LRU order only needs to be coarse; skip rewriting hot rows.
+                if now - row["accessed_at"] > 60:
+                    touched.append(row["url_key"])
+
+            if touched:
+                conn.execute("""
+                    UPDATE article_cache SET accessed_at = ?
+                    WHERE url_key IN (SELECT value FROM json_each(?))
+                """, (now, json.dumps(touched)))
+
+        return found
+
+    def put_many(self, articles):
+        """Store {url: article}; an empty article records a failed fetch."""
+        if not articles:
+            return
+
+        now = time.time()
+        rows = []
+
+        for url, article in articles.items():
+            body = zlib.compress(json.dumps(article).encode(), 6)
+            rows.append((article_cache_key(url), url, body, len(body), now, now))
+
+        with self.pool.connection() as conn:
+            cur = conn.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+
+            cur.executemany("""
+                INSERT OR REPLACE INTO article_cache (
+                    url_key, url, body, size, fetched_at, accessed_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, rows)
+
+            cur.executemany("""
+                UPDATE entry_search SET body = ?
+                WHERE rowid IN (SELECT rowid FROM feed_entries WHERE link = ?)
+            """, [
+                (article["text"][:SEARCH_BODY_MAX_CHARS], url)
+                for url, article in articles.items()
+                if article["text"]
+            ])
+
+            # Drop everything past the byte budget, newest reads first.
+            cur.execute("""
+                DELETE FROM article_cache
+                WHERE url_key IN (
+                    SELECT url_key FROM (
+                        SELECT url_key, SUM(size) OVER (ORDER BY accessed_at DESC) AS running
+                        FROM article_cache
+                    )
+                    WHERE running > ?
+                )
+            """, (self.max_bytes,))
+
+            conn.commit()
+
+
+@st.cache_resource(show_spinner=False)
+def get_article_cache():
+    return ArticleCache(get_content_pool())
+
+
+HTTP_MAX_CONNECTIONS = 32
+HTTP_MAX_PER_HOST = 4
+HTTP_DNS_TTL = 300
+ARTICLE_FETCH_TIMEOUT = 6
+
+BROWSER_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class AsyncFetcher:
+    """
+    Process-wide event loop on a background thread that owns one aiohttp session.
+
+    Keeping the loop and session alive across reruns keeps connections
+    warm (keep-alive, TLS session reuse, cached DNS). The connector caps
+    open connections globally and per host, so a page of articles from one
+    news site never opens more than ``limit_per_host`` sockets to it.
+    Script code calls ``submit``/``run`` from its own thread.
+    """
+
+    def __init__(self, limit=HTTP_MAX_CONNECTIONS, limit_per_host=HTTP_MAX_PER_HOST,
+                 dns_ttl=HTTP_DNS_TTL):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="eko-http", daemon=True)
+        self._thread.start()
+        self._lock = threading.Lock()
+        self._inflight = {}     # (kind, url) -> Future
+        # Finished fetches are written to their cache here, off the loop.
+        self._recorder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="eko-http-record")
+        self.session = self.run(self._open_session(limit, limit_per_host, dns_ttl))
+        atexit.register(self.close)
+
+    async def _open_session(self, limit, limit_per_host, dns_ttl):
+        connector = aiohttp.TCPConnector(
+            limit=limit,
+            limit_per_host=limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=dns_ttl,
+        )
+        return aiohttp.ClientSession(connector=connector, headers=BROWSER_HEADERS)
+
+    def submit(self, coro):
+        """Schedule ``coro`` on the shared loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        return self.submit(coro).result(timeout=timeout)
+
+    def fetch_once(self, kind, url, coro, put_many):
+        """
+        Run ``coro`` unless a ``kind`` fetch of ``url`` is already in flight,
+        and return the future of whichever fetch is running.
+
+        The result is recorded with ``put_many({url: result})`` once it is
+        ready, whether or not any render is still waiting for it, so pages
+        and thumbnails that miss a render's deadline are not fetched again.
+        """
+        key = (kind, url)
+
+        with self._lock:
+            future = self._inflight.get(key)
+
+            if future is not None and not future.done():
+                coro.close()
+                return future
+
+            future = self._inflight[key] = self.submit(coro)
+
+        future.add_done_callback(lambda f: self._recorder.submit(self._record, key, f, put_many))
+        return future
+
+    def _record(self, key, future, put_many):
+        try:
+            if not future.cancelled() and future.exception() is None:
+                put_many({key[1]: future.result()})
+        finally:
+            # Only forget the fetch once its result can be found in the cache
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+    def close(self):
+        if not self.session.closed:
+            self.run(self.session.close(), timeout=5)
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_fetcher():
+    return AsyncFetcher()
+
+
+PUBLISHED_TIME_XPATHS = (
+    '//meta[@property="article:published_time"]/@content',
+    '//meta[@name="article:published_time"]/@content',
+    '//meta[@itemprop="datePublished"]/@content',
+    '//meta[@name="date"]/@content',
+    '//time[@datetime]/@datetime',
+)
+
+
+def first_match(doc, *xpaths):
+    for xpath in xpaths:
+        for value in doc.xpath(xpath):
+            value = value.strip()
+            if value:
+                return value
+
+    return None
+
+
+def parse_article(html_content, base_url):
+    """Everything the app needs from an article page, from a single parse."""
+    doc = lxml.html.fromstring(html_content)
+    article = empty_article()
+
+    article["text"] = " ".join(p.text_content() for p in doc.iter("p"))
+
+    image = first_match(doc, '//meta[@property="og:image"]/@content', "//img/@src")
+    canonical = first_match(doc, '//link[@rel="canonical"]/@href', '//meta[@property="og:url"]/@content')
+
+    article["image_url"] = urljoin(base_url, image) if image else None
+    article["canonical_url"] = urljoin(base_url, canonical) if canonical else None
+    article["published_time"] = first_match(doc, *PUBLISHED_TIME_XPATHS)
+
+    return article
+
+
+async def fetch_article_async(session, url):
+    try:
+        timeout = aiohttp.ClientTimeout(total=ARTICLE_FETCH_TIMEOUT)
+
+        async with session.get(url, timeout=timeout) as resp:
+            if resp.status >= 400:
+                return empty_article()
+
+            html_content = await resp.read()
+            base_url = str(resp.url)
+
+        # Parse off the loop so other downloads keep flowing meanwhile.
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, parse_article, html_content, base_url)
+
+    except Exception:
+        return empty_article()
+
+
+def start_article_fetches(urls):
+    """
+    Split ``urls`` into cached articles and fetches started on the shared loop.
+
+    Each page is downloaded and parsed once for its text, og:image, canonical
+    URL and published time. Returns ({url: article}, {url: Future}). The
+    futures resolve independently, so callers can consume them in completion
+    order with ``as_completed``. Finished fetches record themselves in the
+    article cache, and a page already being fetched, by this run or an
+    earlier one, is not fetched again.
+    """
+    cache = get_article_cache()
+    articles = cache.get_many(urls)
+    missing = [u for u in dict.fromkeys(urls) if u not in articles]
+    futures = {}
+
+    if missing:
+        fetcher = get_http_fetcher()
+        futures = {
+            u: fetcher.fetch_once("page", u, fetch_article_async(fetcher.session, u), cache.put_many)
+            for u in missing
+        }
+
+    return articles, futures
+
+
+async def prefetch_async(session, article_cache, thumbnail_cache, page_urls, image_urls):
+    loop = asyncio.get_running_loop()
+
+    pages, thumbs = await asyncio.gather(
+        asyncio.gather(*(fetch_article_async(session, u) for u in page_urls)),
+        asyncio.gather(*(fetch_thumbnail_async(session, u) for u in image_urls)),
+    )
+    results = dict(zip(image_urls, thumbs))
+
+    # og:images only become known once their page has been read
+    late = [u for u in dict.fromkeys(a["image_url"] for a in pages if a["image_url"]) if u not in results]
+    known = await loop.run_in_executor(None, thumbnail_cache.get_many, late)
+    late = [u for u in late if u not in known]
+    results.update(zip(late, await asyncio.gather(*(fetch_thumbnail_async(session, u) for u in late))))
+
+    await loop.run_in_executor(None, article_cache.put_many, dict(zip(page_urls, pages)))
+    await loop.run_in_executor(None, thumbnail_cache.put_many, results)
+
+
+def prefetch_cards(entries):
+    """
+    Warm the article and thumbnail caches for cards that are about to be shown.
+
+    Returns at once; everything runs on the shared loop and lands in the
+    caches, so the next page renders from them without waiting.
+    """
+    article_cache = get_article_cache()
+    thumbnail_cache = get_thumbnail_cache()
+
+    pages = list(dict.fromkeys(e.link for e in entries if not e.image_url))
+    cached = article_cache.get_many(pages)
+
+    images = [e.image_url for e in entries if e.image_url]
+    images += [a["image_url"] for a in cached.values() if a["image_url"]]
+    images = list(dict.fromkeys(images))
+    known = thumbnail_cache.get_many(images)
+
+    page_urls = [u for u in pages if u not in cached]
+    image_urls = [u for u in images if u not in known]
+
+    if page_urls or image_urls:
+        fetcher = get_http_fetcher()
+        fetcher.submit(prefetch_async(fetcher.session, article_cache, thumbnail_cache, page_urls, image_urls))
+
+
+# ─────────────────────────────────────────────────────────────────
+# NLP
+# ─────────────────────────────────────────────────────────────────
+NER_LABELS = ("PERSON", "ORG", "GPE")
+NER_MAX_CHARS = 5000
+NER_BATCH_SIZE = 32
+NER_PROCESSES = 1
+
+# Pick a tier per deployment: EKO_ENTITY_EXTRACTOR=sm|md|lg|rules.
+# bench_extractors.py compares them on real article text.
+ENTITY_EXTRACTOR = os.environ.get("EKO_ENTITY_EXTRACTOR", "lg")
+
+# Only NER is read. In the sm/md/lg pipelines it has its own tok2vec layer,
+# so everything else can be left out at load time.
+SPACY_UNUSED_PIPES = ("tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer")
+
+
+class SpacyEntityExtractor:
+    """Entity extraction with a trained spaCy pipeline loaded with NER alone."""
+
+    def __init__(self, model):
+        self.model = model
+        self.nlp = spacy.load(model, exclude=SPACY_UNUSED_PIPES)
+
+    def extract_batch(self, texts, batch_size=NER_BATCH_SIZE, n_process=NER_PROCESSES):
+        docs = self.nlp.pipe(
+            (t[:NER_MAX_CHARS] for t in texts),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+
+        return [
+            Counter(e.text for e in doc.ents if e.label_ in NER_LABELS)
+            for doc in docs
+        ]
+
+
+class CapitalizationEntityExtractor:
+    """
+    Model-free extractor: runs of capitalized words, minus common
+    sentence-starters, with a few well-known aliases folded onto one name.
+
+    A capitalized word that only ever opens a sentence ("However", "After")
+    is taken for an ordinary word. Loads instantly and needs no memory
+    beyond this module. It cannot tell people from places, which the polls
+    do not need anyway.
+    """
+
+    # A word is an abbreviation like "U.S." or a capitalized word that may
+    # contain dots ("St.Louis") but never ends in one, so a run of names
+    # stops at the end of a sentence.
+    WORD = r"(?:[A-Z]\.){2,}|[A-Z](?:[\w'’&-]|\.(?=\w))*"
+    CANDIDATE = re.compile(rf"(?:{WORD})(?:\s+(?:(?:of|the|de|del|van|von|al|bin)\s+)?(?:{WORD}))*")
+    SENTENCE_END = re.compile(r"(?:^|[.!?][\"'’”)\]]*)\s*$")
+
+    STOPWORDS = frozenset("""
+        a an and as at but by for from he her his i if in it its mr mrs ms dr
+        no not of on or our she so that the their then there these they this
+        those to we what when where which while who why with you your
+        monday tuesday wednesday thursday friday saturday sunday
+        january february march april may june july august september october
+        november december today yesterday tomorrow breaking live watch read
+        getty images reuters ap afp photo video image copyright
+    """.split())
+
+    ALIASES = {
+        "US": "United States", "U.S.": "United States", "USA": "United States",
+        "America": "United States", "UK": "United Kingdom", "U.K.": "United Kingdom",
+        "Britain": "United Kingdom", "EU": "European Union", "UN": "United Nations",
+        "Nato": "NATO",
+    }
+
+    def extract_batch(self, texts, batch_size=None, n_process=None):
+        return [self.extract(t[:NER_MAX_CHARS]) for t in texts]
+
+    def extract(self, text):
+        runs = []
+        mid_sentence = set()
+
+        for match in self.CANDIDATE.finditer(text):
+            words = match.group().split()
+            opens_sentence = bool(self.SENTENCE_END.search(text, 0, match.start()))
+            runs.append((words, opens_sentence))
+            mid_sentence.update(words[1:] if opens_sentence else words)
+
+        counts = Counter()
+
+        for words, opens_sentence in runs:
+            if opens_sentence and words[0] not in mid_sentence:
+                words = words[1:]
+
+            while words and words[0].lower().strip(".'’") in self.STOPWORDS:
+                words = words[1:]
+
+            name = " ".join(words).rstrip("'’-")
+
+            if len(name) < 2 or name.lower() in self.STOPWORDS:
+                continue
+
+            counts[self.ALIASES.get(name, name)] += 1
+
+        return counts
+
+
+ENTITY_EXTRACTORS = {
+    "sm": lambda: SpacyEntityExtractor("en_core_web_sm"),
+    "md": lambda: SpacyEntityExtractor("en_core_web_md"),
+    "lg": lambda: SpacyEntityExtractor("en_core_web_lg"),
+    "rules": CapitalizationEntityExtractor,
+}
+
+
+@st.cache_resource
+def load_extractor(name=ENTITY_EXTRACTOR):
+    if name not in ENTITY_EXTRACTORS:
+        st.error(
+            f"Unknown entity extractor '{name}' in EKO_ENTITY_EXTRACTOR. "
+            f"Choose one of: {', '.join(ENTITY_EXTRACTORS)}"
+        )
+        st.stop()
+
+    try:
+        return ENTITY_EXTRACTORS[name]()
+    except OSError:
+        model = f"en_core_web_{name}"
+        st.error(
+            f"spaCy model '{model}' is not installed. "
+            f"Run: python -m spacy download {model}"
+        )
+        st.stop()
+
 
-    if "voted_articles" not in st.session_state:
-        raw = controller.get("voted_articles") or "[]"
+def extract_entities_batch(texts, batch_size=NER_BATCH_SIZE, n_process=NER_PROCESSES):
+    """
+    Entity frequency counts for each of ``texts``, in order.
 
-        if not isinstance(raw, str):
-            raw = json.dumps(raw)
+    All texts go through the configured extractor in one batch; for the
+    spaCy tiers that is a single ``nlp.pipe`` call, and ``n_process`` > 1
+    forks workers for large backfills.
+    """
+    return load_extractor().extract_batch(texts, batch_size=batch_size, n_process=n_process)
 
-        try:
-            st.session_state["voted_articles"] = json.loads(raw)
-        except json.JSONDecodeError:
-            st.session_state["voted_articles"] = []
 
-    return True
+def extract_entities(text):
+    return extract_entities_batch([text])[0]
 
 
-def register_anonymous():
-    """
-    Anonymous registration without Firebase.
-    Uses browser cookies and best-effort IP capture.
-    """
-    st.markdown("<h2 style='text-align:center;'>Register anonymously</h2>", unsafe_allow_html=True)
-    st.write("No email needed — your identity stays protected.")
-    st.caption("Your IP address may be used only to maintain anonymous voting integrity.")
+POLL_OPTIONS_CACHE_SIZE = 4096
 
-    if st.button("Continue anonymously", key="anon_reg_btn"):
-        anon_id = controller.get("anonymous_id")
 
-        if not anon_id:
-            client_ip = get_client_ip()
-            raw_id = f"{client_ip}_{time.time()}_{random.randint(1000, 9999)}"
-            anon_id = hashlib.sha256(raw_id.encode()).hexdigest()
+class BoundedCache:
+    """Thread-safe LRU mapping shared across sessions, capped at ``max_entries``."""
 
-            controller.set("anonymous_id", anon_id)
-            controller.set("user_ip", client_ip)
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
 
-        random_name = controller.get("anonymous_name")
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
 
-        if not random_name:
-            random_name = f"User{random.randint(1000, 9999)}"
-            controller.set("anonymous_name", random_name)
+            if value is not None:
+                self._entries.move_to_end(key)
 
-        controller.set("user", anon_id)
+            return value
 
-        st.session_state.update({
-            "user": anon_id,
-            "username": random_name,
-            "voted_articles": [],
-            "page": "Main",
-        })
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
 
-        st.success("Registered anonymously.")
-        st.rerun()
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
 
-def logout():
-    if st.sidebar.button("Logout", key="logout_btn"):
-        for k in ["user", "voted_articles", "username"]:
-            st.session_state.pop(k, None)
+@st.cache_resource(show_spinner=False)
+def get_options_cache():
+    return BoundedCache(POLL_OPTIONS_CACHE_SIZE)
 
-        controller.remove("user")
-        st.rerun()
 
+def quick_options(entry):
+    """Options that need no article text, or None when NER has to decide."""
+    title = entry.title.lower()
 
-# ─────────────────────────────────────────────────────────────────
-# Voting database functions
-# ─────────────────────────────────────────────────────────────────
-def has_user_voted(article_id):
-    user_fingerprint = get_user_fingerprint()
+    if any(w in title for w in ["policy", "election", "vote", "bill", "law", "ban"]):
+        return ["Yes", "No", "Not sure"]
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    return None
 
-    cur.execute("""
-        SELECT option_text
-        FROM user_votes
-        WHERE article_id = ?
-        AND user_fingerprint = ?
-    """, (article_id, user_fingerprint))
 
-    row = cur.fetchone()
-    conn.close()
+def options_from_entities(counts):
+    if counts:
+        return [name for name, _ in counts.most_common(5)]
 
-    return row["option_text"] if row else None
+    return ["Support", "Oppose", "Neutral"]
 
 
-def record_vote(article_id, article_url, article_title, option_text):
+def load_poll_options(article_ids):
     """
-    Records one vote if the user has not already voted on the article.
+    Stored options for whichever of ``article_ids`` already have them.
 
-    Returns True if vote was recorded.
-    Returns False if user already voted.
+    Hot articles are answered from the shared in-memory cache; the rest come
+    from the ``poll_options`` table in one query.
     """
-    user_fingerprint = get_user_fingerprint()
-    now = datetime.now().isoformat()
+    cache = get_options_cache()
+    found = {}
 
-    conn = get_db_connection()
-    cur = conn.cursor()
+    for aid in article_ids:
+        options = cache.get(aid)
 
-    try:
-        # This insert enforces one vote per user per article.
-        cur.execute("""
-            INSERT INTO user_votes (
-                article_id,
-                user_fingerprint,
-                option_text,
-                voted_at
-            )
-            VALUES (?, ?, ?, ?)
-        """, (article_id, user_fingerprint, option_text, now))
+        if options:
+            found[aid] = options
 
-        # This upsert increments the public total count for the selected option.
-        cur.execute("""
-            INSERT INTO article_votes (
-                article_id,
-                article_url,
-                article_title,
-                option_text,
-                vote_count
-            )
-            VALUES (?, ?, ?, ?, 1)
-            ON CONFLICT(article_id, option_text)
-            DO UPDATE SET vote_count = vote_count + 1
-        """, (article_id, article_url, article_title, option_text))
+    missing = [aid for aid in article_ids if aid not in found]
 
-        conn.commit()
-        return True
+    if missing:
+        with get_db_connection() as conn:
+            rows = conn.execute("""
+                SELECT article_id, options
+                FROM poll_options
+                WHERE article_id IN (SELECT value FROM json_each(?))
+            """, (json.dumps(missing),)).fetchall()
 
-    except sqlite3.IntegrityError:
-        return False
+        for row in rows:
+            found[row["article_id"]] = json.loads(row["options"])
+            cache.put(row["article_id"], found[row["article_id"]])
 
-    finally:
-        conn.close()
+    return found
 
 
-def get_vote_results(article_id, options=None):
-    conn = get_db_connection()
-    cur = conn.cursor()
+def save_poll_options(options_by_id):
+    """
+    Persist options once per article and return what is stored.
 
-    cur.execute("""
-        SELECT option_text, vote_count
-        FROM article_votes
-        WHERE article_id = ?
-        ORDER BY vote_count DESC
-    """, (article_id,))
+    The first writer wins: if another session or process stored options for
+    an article first, theirs are returned, so every viewer sees the same
+    buttons next to the same tallies.
+    """
+    if not options_by_id:
+        return {}
 
-    rows = cur.fetchall()
-    conn.close()
+    now = datetime.now().isoformat()
 
-    results = {row["option_text"]: row["vote_count"] for row in rows}
+    with get_db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("BEGIN IMMEDIATE")
 
-    if options:
-        for opt in options:
-            results.setdefault(opt, 0)
+        cur.executemany("""
+            INSERT INTO poll_options (article_id, options, created_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(article_id) DO NOTHING
+        """, [(aid, json.dumps(opts), now) for aid, opts in options_by_id.items()])
 
-    return results
+        rows = cur.execute("""
+            SELECT article_id, options
+            FROM poll_options
+            WHERE article_id IN (SELECT value FROM json_each(?))
+        """, (json.dumps(list(options_by_id)),)).fetchall()
 
+        conn.commit()
 
-# ─────────────────────────────────────────────────────────────────
-# Feed helpers
-# ─────────────────────────────────────────────────────────────────
-def filter_by_date(entries, days=3):
-    now = datetime.now()
-    out = []
+    stored = {row["article_id"]: json.loads(row["options"]) for row in rows}
+    cache = get_options_cache()
 
-    for e in entries:
-        try:
-            pub = datetime(*e.published_parsed[:6])
-            if now - timedelta(days=days) <= pub <= now:
-                out.append(e)
-        except Exception:
-            out.append(e)
+    for aid, options in stored.items():
+        cache.put(aid, options)
 
-    return out
+    return stored
 
 
-@st.cache_data(ttl=300, show_spinner=False)
-def fetch_feed(url: str):
-    """Fetch a single RSS feed with a browser User-Agent to avoid 403s."""
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-    }
+def compute_options_batch(entries, contents):
+    """
+    Options for polls that are actually being shown, with one NER pass for all of them.
 
-    try:
-        r = requests.get(url, headers=headers, timeout=8)
-        return feedparser.parse(r.text)
-    except Exception:
-        return feedparser.parse(url)
+    Returns {article_id: options} as stored. Everything is persisted, the
+    default options of a page that failed to load included: buttons that
+    have been shown may have votes behind them, so they must never change.
+    Callers only pass bodies from fetches that completed.
+    """
+    options = {}
+    ner_entries, ner_texts = [], []
 
+    for entry, content in zip(entries, contents):
+        quick = quick_options(entry)
 
-async def fetch_article_text_async(session, url):
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-        }
+        if quick:
+            options[entry.entry_id] = quick
+        else:
+            ner_entries.append(entry)
+            ner_texts.append(content)
 
-        async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=6)) as resp:
-            html_content = await resp.read()
-            soup = BeautifulSoup(html_content, "lxml")
-            text = " ".join(p.get_text() for p in soup.find_all("p"))
-            return text or ""
+    if ner_texts:
+        for entry, counts in zip(ner_entries, extract_entities_batch(ner_texts)):
+            options[entry.entry_id] = options_from_entities(counts)
 
-    except Exception:
-        return ""
+    return save_poll_options(options)
 
 
-async def fetch_all_texts(urls):
-    async with aiohttp.ClientSession() as session:
-        return await asyncio.gather(*[fetch_article_text_async(session, u) for u in urls])
+def compute_options(entry, content):
+    return compute_options_batch([entry], [content])[entry.entry_id]
 
 
 # ─────────────────────────────────────────────────────────────────
-# NLP
+# Poll UI
 # ─────────────────────────────────────────────────────────────────
-@st.cache_resource
-def load_nlp():
-    try:
-        return spacy.load("en_core_web_lg")
-    except OSError:
-        st.error(
-            "spaCy model 'en_core_web_lg' is not installed. "
-            "Run: python -m spacy download en_core_web_lg"
-        )
-        st.stop()
+# Polls and save buttons rerun on their own when clicked instead of the whole
+# page. st.fragment is the stable name from Streamlit 1.37 on.
+fragment = getattr(st, "fragment", None) or st.experimental_fragment
 
 
-@st.cache_data(show_spinner=False)
-def extract_entities(text):
-    nlp = load_nlp()
-    doc = nlp(text[:5000])
+def poll_notice_key(article_id):
+    return f"poll_notice_{article_id}"
 
-    return list({
-        e.text
-        for e in doc.ents
-        if e.label_ in ["PERSON", "ORG", "GPE"]
-    })
 
+def poll_state_key(article_id):
+    return f"poll_state_{article_id}"
 
-def determine_options(entry, content):
-    title = entry.title.lower()
 
-    if any(w in title for w in ["policy", "election", "vote", "bill", "law", "ban"]):
-        return ["Yes", "No", "Not sure"]
+def cast_vote(article_id, article_url, article_title, option_text):
+    try:
+        recorded = record_vote(
+            article_id=article_id,
+            article_url=article_url,
+            article_title=article_title,
+            option_text=option_text,
+        )
+    except VoteRejected as exc:
+        st.session_state[poll_notice_key(article_id)] = exc.reason
+        return
+    except (FutureTimeoutError, sqlite3.Error):
+        # The batch may still commit later; the reloaded poll will show it.
+        st.session_state[poll_notice_key(article_id)] = "error"
+        st.session_state.pop(poll_state_key(article_id), None)
+        return
 
-    entities = extract_entities(content)
+    st.session_state[poll_notice_key(article_id)] = "recorded" if recorded else "duplicate"
+    # The poll's own vote changes more than the tally; reload it in full
+    st.session_state.pop(poll_state_key(article_id), None)
 
-    if entities:
-        counts = {e: entities.count(e) for e in set(entities)}
-        top = sorted(counts, key=counts.get, reverse=True)[:5]
-        return top
 
-    return ["Support", "Oppose", "Neutral"]
+def cast_custom_vote(article_id, article_url, article_title):
+    custom = st.session_state.get(f"custom_{article_id}", "")
 
+    if custom:
+        cast_vote(article_id, article_url, article_title, f"#{custom.replace(' ', '')}")
 
-# ─────────────────────────────────────────────────────────────────
-# Poll UI
-# ─────────────────────────────────────────────────────────────────
-def create_poll(article_id, article_url, article_title, options):
+
+def create_poll(article_id, article_url, article_title, options, state=None):
     st.markdown("**Have your say:**")
 
-    already_voted_option = has_user_voted(article_id)
+    if state is None:
+        state = load_poll_states([article_id], get_user_fingerprint())[article_id]
+
+    already_voted_option = state.voted_option
+    notice = st.session_state.pop(poll_notice_key(article_id), None)
+    vote_args = (article_id, article_url, article_title)
+
+    if notice == "recorded":
+        st.success("Vote recorded.")
+    elif notice == "duplicate":
+        st.warning("You've already voted on this article.")
+    elif notice == "limited":
+        st.warning("You're voting too fast. Try again in a few seconds.")
+    elif notice == "busy":
+        st.warning("Voting is very busy right now. Try again in a moment.")
+    elif notice == "error":
+        st.warning("Your vote could not be saved. Please try again.")
 
     if already_voted_option:
         st.info(f"You have already voted on this article: `{already_voted_option}`")
     else:
         custom = st.text_input("Add your own stance:", key=f"custom_{article_id}")
 
-        if custom and st.button("Add & vote", key=f"add_custom_{article_id}"):
-            tag = f"#{custom.replace(' ', '')}"
-
-            success = record_vote(
-                article_id=article_id,
-                article_url=article_url,
-                article_title=article_title,
-                option_text=tag,
-            )
-
-            if success:
-                st.success("Vote recorded.")
-                st.rerun()
-            else:
-                st.warning("You've already voted on this article.")
+        if custom:
+            st.button("Add & vote", key=f"add_custom_{article_id}", on_click=cast_custom_vote, args=vote_args)
 
         cols = st.columns(min(len(options), 3))
 
@@ -533,21 +2900,13 @@ def create_poll(article_id, article_url, article_title, options):
             tag = f"#{opt.replace(' ', '')}" if not opt.startswith("#") else opt
 
             with cols[i % 3]:
-                if st.button(tag, key=f"vote_{article_id}_{opt}"):
-                    success = record_vote(
-                        article_id=article_id,
-                        article_url=article_url,
-                        article_title=article_title,
-                        option_text=opt,
-                    )
+                st.button(tag, key=f"vote_{article_id}_{opt}", on_click=cast_vote, args=(*vote_args, opt))
 
-                    if success:
-                        st.success("Vote recorded.")
-                        st.rerun()
-                    else:
-                        st.warning("You've already voted on this article.")
+    results = dict(state.results)
+
+    for opt in options:
+        results.setdefault(opt, 0)
 
-    results = get_vote_results(article_id, options)
     total = sum(results.values())
 
     st.markdown("**Current results:**")
@@ -561,6 +2920,190 @@ def create_poll(article_id, article_url, article_title, options):
             st.progress(pct / 100)
 
 
+# Cards per page of the article grid; a multiple of its three columns
+GRID_PAGE_SIZE = 12
+
+
+def set_grid_page(page):
+    st.session_state["grid_page"] = page
+
+
+def render_pager(page, page_count, key):
+    if page_count <= 1:
+        return
+
+    prev_col, label_col, next_col = st.columns([1, 2, 1])
+
+    with prev_col:
+        st.button(
+            "← Newer", key=f"{key}_prev", disabled=page == 0,
+            on_click=set_grid_page, args=(page - 1,),
+        )
+
+    with label_col:
+        st.caption(f"Page {page + 1} of {page_count}")
+
+    with next_col:
+        st.button(
+            "Older →", key=f"{key}_next", disabled=page >= page_count - 1,
+            on_click=set_grid_page, args=(page + 1,),
+        )
+
+
+def poll_toggle_key(article_id):
+    return f"uproar_{article_id}"
+
+
+# Open polls refresh their results on this timer. A tick only reads SQLite
+# when the vote change feed says the article got new votes.
+POLL_REFRESH_INTERVAL = 5
+
+
+def render_card_poll(entry, options, state):
+    # The page's bulk-loaded state seeds the fragment; its own reruns (a vote
+    # or the refresh timer) keep it current from there.
+    st.session_state[poll_state_key(entry.entry_id)] = state
+    poll_fragment(entry, options)
+
+
+@fragment(run_every=POLL_REFRESH_INTERVAL)
+def poll_fragment(entry, options):
+    article_id = entry.entry_id
+    state = st.session_state.get(poll_state_key(article_id))
+
+    if state is None:
+        state = load_poll_states([article_id], get_user_fingerprint())[article_id]
+    else:
+        state.seen, changed = tallies_changed_since(state.seen, [article_id])
+
+        if article_id in changed:
+            state.results = changed[article_id]
+
+    st.session_state[poll_state_key(article_id)] = state
+
+    with st.container(border=True):
+        create_poll(
+            article_id=article_id,
+            article_url=entry.link,
+            article_title=entry.title,
+            options=options,
+            state=state,
+        )
+
+
+def save_post(article_id, title, link):
+    saved = st.session_state.saved_posts
+
+    if any(p["link"] == link for p in saved):
+        st.session_state[f"save_notice_{article_id}"] = "exists"
+    else:
+        saved.append({"title": title, "link": link})
+        st.session_state[f"save_notice_{article_id}"] = "saved"
+
+
+@fragment
+def save_fragment(entry):
+    article_id = entry.entry_id
+
+    st.button(
+        "💾 Save", key=f"save_{article_id}",
+        on_click=save_post, args=(article_id, entry.title, entry.link),
+    )
+
+    notice = st.session_state.pop(f"save_notice_{article_id}", None)
+
+    if notice == "saved":
+        st.success("Saved.")
+    elif notice == "exists":
+        st.info("Already saved.")
+
+
+CARD_VIEW_CACHE_SIZE = 4096
+CARD_SUMMARY_CHARS = 200
+
+
+@dataclass(frozen=True, slots=True)
+class CardView:
+    """The text parts of a card, escaped and ready to be formatted into HTML."""
+
+    url: str
+    title: str
+    source: str
+    summary: str
+    copy_url: str
+    twitter_url: str
+    facebook_url: str
+    linkedin_url: str
+
+    @classmethod
+    def from_entry(cls, entry):
+        safe_url = html.escape(entry.link, quote=True)
+        safe_title = html.escape(entry.title, quote=True)
+
+        return cls(
+            url=safe_url,
+            title=safe_title,
+            source=html.escape(entry.source, quote=True),
+            summary=html.escape(entry.summary[:CARD_SUMMARY_CHARS], quote=True),
+            copy_url=quote(entry.link, safe=""),
+            twitter_url=f"https://twitter.com/intent/tweet?url={safe_url}&text={safe_title}",
+            facebook_url=f"https://www.facebook.com/sharer/sharer.php?u={safe_url}",
+            linkedin_url=f"https://www.linkedin.com/shareArticle?mini=true&url={safe_url}&title={safe_title}",
+        )
+
+
+@st.cache_resource(show_spinner=False)
+def get_card_views():
+    return BoundedCache(CARD_VIEW_CACHE_SIZE)
+
+
+def card_view(entry):
+    """Prepared view for ``entry``; normally built by the ingestor already."""
+    views = get_card_views()
+    view = views.get(entry.entry_id)
+
+    if view is None:
+        view = CardView.from_entry(entry)
+        views.put(entry.entry_id, view)
+
+    return view
+
+
+def render_card_html(entry, image_url, palette=DEFAULT_PALETTE):
+    view = card_view(entry)
+    img_html = ""
+
+    if image_url:
+        safe_img_url = html.escape(image_url, quote=True)
+        img_html = (
+            f'<img src="{safe_img_url}" alt="" loading="lazy" decoding="async" '
+            f'onerror="this.style.display=\'none\'" />'
+        )
+
+    gradient = create_css_gradient(palette)
+
+    return f"""
+<div class="news-card">
+    <div class="accent" style="background: {gradient}"></div>
+    {img_html}
+    <div class="meta">
+        <span class="source-pill">{view.source}</span>
+    </div>
+    <h3><a href="{view.url}" target="_blank">{view.title}</a></h3>
+    <p>{view.summary}…</p>
+    <div class="share-btn">
+        <button class="dropbtn">Share ▾</button>
+        <div class="dropdown-content">
+            <a href="#" onclick="copyToClipboard(decodeURIComponent('{view.copy_url}'))">📋 Copy link</a>
+            <a href="{view.twitter_url}" target="_blank">🐦 Twitter</a>
+            <a href="{view.facebook_url}" target="_blank">📘 Facebook</a>
+            <a href="{view.linkedin_url}" target="_blank">💼 LinkedIn</a>
+        </div>
+    </div>
+</div>
+"""
+
+
 # ─────────────────────────────────────────────────────────────────
 # Tutorial page
 # ─────────────────────────────────────────────────────────────────
@@ -639,6 +3182,14 @@ html, body, [class*="css"] { font-family: 'Outfit', sans-serif; }
     border-color: rgba(192,132,252,0.4);
 }
 
+.news-card .accent {
+    position: absolute;
+    top: 0;
+    left: 0;
+    right: 0;
+    height: 4px;
+}
+
 .news-card img {
     width: 100%;
     border-radius: 10px;
@@ -860,16 +3411,6 @@ def main():
 """, unsafe_allow_html=True)
 
     # News source picker
-    NEWS_SOURCES = {
-        "Sky News": "https://feeds.skynews.com/feeds/rss/home.xml",
-        "BBC": "http://feeds.bbci.co.uk/news/rss.xml",
-        "RTE": "https://www.rte.ie/rss/news.xml",
-        "Al Jazeera": "http://www.aljazeera.com/xml/rss/all.xml",
-        "ESPN": "https://www.espn.com/espn/rss/news",
-        "Business Insider": "https://www.businessinsider.com/rss",
-        "The Guardian": "https://www.theguardian.com/world/rss",
-    }
-
     c1, c2 = st.columns([3, 1])
 
     with c1:
@@ -889,136 +3430,241 @@ def main():
         st.info("Select at least one news source above.")
         return
 
-    # Fetch feeds
-    with st.spinner("Fetching articles…"):
-        all_entries = []
-
-        for src in selected:
-            feed = fetch_feed(NEWS_SOURCES[src])
+    # Feeds are polled in the background; the page only reads what is stored
+    ingestor = get_feed_ingestor()
+    pending = [src for src in selected if src not in ingestor.polled_sources()]
 
-            for e in feed.entries:
-                e["_source"] = src
-                all_entries.append(e)
+    if pending:
+        # Only a source that has never been ingested makes the page wait, and
+        # then no longer than one feed timeout for all of them together.
+        with st.spinner("Fetching articles…"):
+            ingestor.poll_many(pending, timeout=FEED_FETCH_TIMEOUT)
 
-    entries = filter_by_date(all_entries, days=days)
+        pending = [src for src in selected if src not in ingestor.polled_sources()]
 
-    # Search filter
+    # A search looks through every stored entry, ranked; otherwise the feed window
     if search_q:
-        q = search_q.lower()
-        entries = [
-            e for e in entries
-            if q in e.get("title", "").lower()
-            or q in e.get("summary", "").lower()
-        ]
+        entries = search_entries(search_q, selected)
+    else:
+        entries = load_entries(selected, days=days)
 
-    if not entries:
-        st.warning("No articles found for the selected sources and date range.")
-        return
+    if pending:
+        st.info(f"Still fetching {', '.join(pending)} — refresh in a moment.")
 
-    st.caption(f"{len(entries)} articles · last {days} day{'s' if days != 1 else ''}")
+    # A new filter starts over at the first page
+    grid_filter = (tuple(selected), days, search_q)
 
-    # Fetch article text for poll options
-    with st.spinner("Loading article content…"):
-        urls = [e.link for e in entries]
+    if st.session_state.get("grid_filter") != grid_filter:
+        st.session_state["grid_filter"] = grid_filter
+        st.session_state["grid_page"] = 0
+
+    if not entries:
+        if not pending:
+            st.warning("No articles found for the selected sources and date range.")
+        return
 
+    if search_q:
+        st.caption(f"{len(entries)} matching articles")
+    else:
+        st.caption(f"{len(entries)} articles · last {days} day{'s' if days != 1 else ''}")
+
+    # Only one page of cards is rendered, and everything below (page fetches,
+    # NER, thumbnails, poll state) is scoped to it.
+    page_count = -(-len(entries) // GRID_PAGE_SIZE)
+    page = min(st.session_state.get("grid_page", 0), page_count - 1)
+    next_entries = entries[(page + 1) * GRID_PAGE_SIZE:(page + 2) * GRID_PAGE_SIZE]
+    entries = entries[page * GRID_PAGE_SIZE:(page + 1) * GRID_PAGE_SIZE]
+
+    render_pager(page, page_count, "pager_top")
+
+    voting_enabled = show_votes and check_login()
+
+    # Polls stay collapsed until opened, and only an open poll costs anything.
+    # Their toggle state is already in session_state at the top of the run.
+    open_polls = [
+        e for e in entries
+        if voting_enabled and st.session_state.get(poll_toggle_key(e.entry_id))
+    ]
+    poll_options = load_poll_options([e.entry_id for e in open_polls])
+
+    # Title-keyword polls need no article text; store them straight away
+    quick = [e for e in open_polls if e.entry_id not in poll_options and quick_options(e)]
+
+    if quick:
+        poll_options.update(compute_options_batch(quick, [""] * len(quick)))
+
+    # Article pages feed NER for open polls without options yet, and the
+    # og:image for cards whose feed carried none. Each page is fetched and
+    # parsed once. Cached pages are ready now; the rest are fetched in the
+    # background and fill their cards as they arrive.
+    needs_page = [e.link for e in entries if not e.image_url]
+    needs_page += [e.link for e in open_polls if e.entry_id not in poll_options]
+    articles, article_futures = {}, {}
+
+    if needs_page:
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            texts = loop.run_until_complete(fetch_all_texts(urls))
+            articles, article_futures = start_article_fetches(needs_page)
         except Exception:
-            texts = [""] * len(entries)
+            # Cards keep their feed data and polls wait for a later run
+            pass
 
-    # Article grid
-    cols = st.columns(3)
+    # Polls whose pages were cached share a single NER pass
+    ready = [e for e in open_polls if e.entry_id not in poll_options and e.link in articles]
 
-    for idx, (entry, content) in enumerate(zip(entries, texts)):
-        col = cols[idx % 3]
+    if ready:
+        poll_options.update(compute_options_batch(ready, [articles[e.link]["text"] for e in ready]))
 
-        article_url = entry.link
-        article_title = entry.title
-        article_id = hashlib.md5(article_url.encode()).hexdigest()
-        source = entry.get("_source", "")
+    # Poll state for every open poll on the page, loaded in one pass
+    poll_states = {}
 
-        image_url = extract_image_from_entry(entry)
+    if open_polls:
+        poll_states = load_poll_states(
+            [e.entry_id for e in open_polls],
+            get_user_fingerprint(),
+        )
 
-        if not image_url:
-            image_url = scrape_article_image(article_url)
+    # Cards show a local, resized thumbnail. Known image URLs are looked up or
+    # fetched now; og:images found on late pages get theirs once the page lands.
+    image_urls = {
+        entry.entry_id: entry.image_url or articles.get(entry.link, {}).get("image_url")
+        for entry in entries
+    }
+    thumbs, thumb_futures = start_thumbnail_fetches([u for u in image_urls.values() if u])
 
-        safe_url = html.escape(article_url, quote=True)
-        safe_title = html.escape(article_title, quote=True)
-        safe_source = html.escape(source, quote=True)
-        js_safe_url = quote(article_url, safe="")
+    # Article grid
+    cols = st.columns(3)
+    waiting_cards = {}
+    waiting_thumbs = {}
+    waiting_polls = {}
 
-        tw = f"https://twitter.com/intent/tweet?url={safe_url}&text={safe_title}"
-        fb = f"https://www.facebook.com/sharer/sharer.php?u={safe_url}"
-        li = f"https://www.linkedin.com/shareArticle?mini=true&url={safe_url}&title={safe_title}"
+    for idx, entry in enumerate(entries):
+        col = cols[idx % 3]
 
-        img_html = ""
+        article_url = entry.link
+        article_id = entry.entry_id
 
-        if image_url:
-            safe_img_url = html.escape(image_url, quote=True)
-            img_html = (
-                f'<img src="{safe_img_url}" alt="" '
-                f'onerror="this.style.display=\'none\'" />'
-            )
+        image_url = image_urls[article_id]
 
-        summary = entry.get("summary", "")
-        clean_summary = BeautifulSoup(summary, "html.parser").get_text()[:200]
-        safe_summary = html.escape(clean_summary, quote=True)
+        with col:
+            card_slot = st.empty()
 
-        card_html = f"""
-<div class="news-card">
-    {img_html}
-    <div class="meta">
-        <span class="source-pill">{safe_source}</span>
-    </div>
-    <h3><a href="{safe_url}" target="_blank">{safe_title}</a></h3>
-    <p>{safe_summary}…</p>
-    <div class="share-btn">
-        <button class="dropbtn">Share ▾</button>
-        <div class="dropdown-content">
-            <a href="#" onclick="copyToClipboard(decodeURIComponent('{js_safe_url}'))">📋 Copy link</a>
-            <a href="{tw}" target="_blank">🐦 Twitter</a>
-            <a href="{fb}" target="_blank">📘 Facebook</a>
-            <a href="{li}" target="_blank">💼 LinkedIn</a>
-        </div>
-    </div>
-</div>
-"""
+            if image_url in thumb_futures:
+                card_slot.markdown(render_card_html(entry, None), unsafe_allow_html=True)
+                waiting_thumbs.setdefault(image_url, []).append((card_slot, entry))
+            else:
+                thumb = thumbs.get(image_url)
+                card_slot.markdown(
+                    render_card_html(entry, thumbnail_src(image_url, thumb), thumbnail_palette(thumb)),
+                    unsafe_allow_html=True,
+                )
 
-        with col:
-            st.markdown(card_html, unsafe_allow_html=True)
-
-            if st.button("💾 Save", key=f"save_{idx}"):
-                if not any(p["link"] == article_url for p in st.session_state.saved_posts):
-                    st.session_state.saved_posts.append({
-                        "title": article_title,
-                        "link": article_url,
-                    })
-                    st.success("Saved.")
-                else:
-                    st.info("Already saved.")
+            if not image_url and article_url in article_futures:
+                waiting_cards.setdefault(article_url, []).append((card_slot, entry))
+
+            save_fragment(entry)
 
             if show_votes:
-                if check_login():
-                    options = determine_options(entry, content)
-
-                    with st.expander("🗣️ UPROAR — have your say"):
-                        create_poll(
-                            article_id=article_id,
-                            article_url=article_url,
-                            article_title=article_title,
-                            options=options,
-                        )
+                if voting_enabled:
+                    if st.toggle("🗣️ UPROAR — have your say", key=poll_toggle_key(article_id)):
+                        poll_slot = st.empty()
+                        options = poll_options.get(article_id)
+
+                        if options:
+                            with poll_slot.container():
+                                render_card_poll(entry, options, poll_states.get(article_id))
+                        else:
+                            poll_slot.caption("⏳ Loading poll…")
+                            waiting_polls.setdefault(article_url, []).append((poll_slot, entry))
                 else:
                     st.caption("Register anonymously to vote.")
 
-                    if st.button("Join the conversation", key=f"join_{idx}"):
+                    if st.button("Join the conversation", key=f"join_{article_id}"):
                         st.session_state["page"] = "Register"
                         st.rerun()
 
             st.markdown("---")
 
+    render_pager(page, page_count, "pager_bottom")
+
+    # The next page's article pages and thumbnails load while this one is read
+    if next_entries:
+        try:
+            prefetch_cards(next_entries)
+        except Exception:
+            pass
+
+    # Fill in images and polls in the order pages and thumbnails arrive. A page
+    # that brings an og:image queues that image's thumbnail in turn. Fetches
+    # record their own results, so those that miss the deadline still land
+    # in the caches for the next run.
+    pending = {
+        article_futures[url]: ("page", url)
+        for url in waiting_cards.keys() | waiting_polls.keys()
+        if url in article_futures
+    }
+    pending.update({thumb_futures[url]: ("thumb", url) for url in waiting_thumbs})
+    deadline = time.monotonic() + ARTICLE_FETCH_TIMEOUT * 2
+
+    while pending:
+        done, _ = wait(pending, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+
+        if not done:
+            break
+
+        for future in done:
+            kind, url = pending.pop(future)
+
+            if kind == "thumb":
+                thumb = thumbs[url] = future.result()
+                html_args = (thumbnail_src(url, thumb), thumbnail_palette(thumb))
+
+                for card_slot, entry in waiting_thumbs.pop(url, []):
+                    card_slot.markdown(render_card_html(entry, *html_args), unsafe_allow_html=True)
+
+                continue
+
+            article = future.result()
+            image_url = article["image_url"]
+
+            for card_slot, entry in waiting_cards.pop(url, []):
+                if not image_url:
+                    continue
+
+                if image_url not in thumbs and image_url not in thumb_futures:
+                    found, started = start_thumbnail_fetches([image_url])
+                    thumbs.update(found)
+                    thumb_futures.update(started)
+
+                if image_url in thumbs:
+                    thumb = thumbs[image_url]
+                    card_slot.markdown(
+                        render_card_html(entry, thumbnail_src(image_url, thumb), thumbnail_palette(thumb)),
+                        unsafe_allow_html=True,
+                    )
+                else:
+                    waiting_thumbs.setdefault(image_url, []).append((card_slot, entry))
+                    pending[thumb_futures[image_url]] = ("thumb", image_url)
+
+            for poll_slot, entry in waiting_polls.pop(url, []):
+                options = compute_options(entry, article["text"])
+
+                with poll_slot.container():
+                    render_card_poll(entry, options, poll_states.get(entry.entry_id))
+
+    # Thumbnails that missed the deadline fall back to the source image
+    for url, slots in waiting_thumbs.items():
+        for card_slot, entry in slots:
+            card_slot.markdown(render_card_html(entry, url), unsafe_allow_html=True)
+
+    # Polls whose page is still on its way get no buttons yet: options must
+    # be stored before anyone can vote on them. The fetch carries on in the
+    # background, so a retry usually finds the page cached.
+    for slots in waiting_polls.values():
+        for poll_slot, entry in slots:
+            with poll_slot.container():
+                st.caption("⏳ This poll is taking a while to load.")
+                st.button("Retry", key=f"retry_poll_{entry.entry_id}")
+
 
 if __name__ == "__main__":
     main()